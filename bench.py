@@ -0,0 +1,165 @@
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from json import dump, load
+from multiprocessing import get_context
+from time import perf_counter, time
+from traceback import format_exc
+
+import numpy
+from speech_recognition import AudioData, AudioFile, Recognizer
+
+
+class BenchSignals:
+    class BenchLog:
+        def __init__(self, verbose: bool = False):
+            self.verbose = verbose
+            self.lines = []
+
+        def emit(self, msg: str, color: str = "White"):
+            self.lines.append((msg, color))
+            if self.verbose:
+                print(f"  [{color}] {msg}")
+
+    def __init__(self, verbose: bool = False):
+        self.log = self.BenchLog(verbose)
+
+
+def peakMemory():
+    try:
+        from resource import RUSAGE_SELF, getrusage
+    except ImportError:
+        return None
+
+    return getrusage(RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024) // 1048576
+
+
+def loadCorpus(folder: str):
+    labels = {}
+    if os.path.exists(f"{folder}/labels.json"):
+        with open(f"{folder}/labels.json", "r") as fileR:
+            labels = load(fileR)
+
+    corpus = []
+    for fileName in sorted(os.listdir(folder)):
+        if not fileName.lower().endswith((".wav", ".flac", ".aiff")):
+            continue
+
+        label = labels.get(fileName, os.path.splitext(fileName)[0].split("-")[0].replace("_", " "))
+        with AudioFile(f"{folder}/{fileName}") as source:
+            audio = Recognizer().record(source)
+
+        corpus.append((fileName, " ".join(label.lower().split()), audio))
+
+    return corpus
+
+
+def streamAudio(recognizer: object, audio: AudioData, chunkSize: int = 1024):
+    frameData = audio.get_raw_data(convert_width=2) + bytes(audio.sample_rate * 2)
+    commands = []
+
+    for i in range(0, len(frameData), chunkSize * 2):
+        command = recognizer.feed(frameData[i : i + chunkSize * 2], audio.sample_rate)
+        if not command is None and command != "":
+            commands.append(command)
+
+    return " ".join(commands)
+
+
+def benchRecognizer(spec: str, corpusFolder: str, profilePath: str, fuzzy: bool = False, verbose: bool = False):
+    from lib.general import readConfig
+    from lib.matcher import CommandMatcher
+    from lib.recognizers import allRecognizers, loadRecognizer
+
+    name, _, model = spec.partition(":")
+    if not name in allRecognizers:
+        raise ValueError(f"Recognizer {name} not in {tuple(allRecognizers)}!")
+
+    with open(profilePath, "r") as fileR:
+        profile = load(fileR)
+
+    config = readConfig(f"{os.path.split(os.path.abspath(__file__))[0]}/config.json")
+    if model != "":
+        config[f"{name}:Model"] = model
+
+    corpus = loadCorpus(corpusFolder)
+    matcher = CommandMatcher(profile["voiceCommands"], fuzzy=fuzzy)
+    signals = BenchSignals(verbose)
+
+    start = perf_counter()
+    recognizer = loadRecognizer(name)(signals=signals, config=config, profile=profile)
+    if len(corpus) > 0 and getattr(recognizer, "streaming", False):
+        streamAudio(recognizer, corpus[0][2])
+    elif len(corpus) > 0:
+        recognizer.run(corpus[0][2])
+    loadTime = perf_counter() - start
+
+    results = []
+    for fileName, expected, audio in corpus:
+        start = perf_counter()
+        text = streamAudio(recognizer, audio) if getattr(recognizer, "streaming", False) else recognizer.run(audio)
+        latency = perf_counter() - start
+
+        record = matcher.record(text or "")
+        results.append({"file": fileName, "expected": expected, "text": text or "", "command": "" if record is None else record["command"], "duration": len(audio.frame_data) / (audio.sample_rate * audio.sample_width), "latency": latency})
+
+    truePositives = sum(1 for result in results if result["expected"] != "" and result["command"] == result["expected"])
+    falsePositives = sum(1 for result in results if result["command"] != "" and result["command"] != result["expected"])
+    falseNegatives = sum(1 for result in results if result["expected"] != "" and result["command"] != result["expected"])
+
+    latencies = numpy.array(tuple(result["latency"] for result in results) or (0.0,))
+    duration = sum(result["duration"] for result in results)
+
+    return {
+        "recognizer": spec,
+        "files": len(results),
+        "loadTime": loadTime,
+        "audioTime": duration,
+        "realTimeFactor": float(latencies.sum() / duration) if duration > 0 else 0.0,
+        "latency": {"p50": float(numpy.percentile(latencies, 50)), "p95": float(numpy.percentile(latencies, 95)), "max": float(latencies.max())},
+        "peakMemory": peakMemory(),
+        "precision": truePositives / (truePositives + falsePositives) if truePositives + falsePositives > 0 else 0.0,
+        "recall": truePositives / (truePositives + falseNegatives) if truePositives + falseNegatives > 0 else 0.0,
+        "accuracy": sum(1 for result in results if result["command"] == result["expected"]) / len(results) if len(results) > 0 else 0.0,
+        "tiers": recognizer.stats() if hasattr(recognizer, "stats") else None,
+        "results": results,
+    }
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark speech recognizers and command matching on a folder of labeled recordings.")
+    parser.add_argument("corpus", help='Folder with wav/flac/aiff recordings, labeled by labels.json {"file.wav": "command"} or by file name like "open_browser-1.wav".')
+    parser.add_argument("profile", help="Profile json with the voice commands to match against.")
+    parser.add_argument("-r", "--recognizers", nargs="+", default=("vosk",), help='Recognizers to benchmark as name or name:model, like "vosk:small-en whisper:tiny sphinx".')
+    parser.add_argument("-o", "--output", default="bench.json", help="Path of the json report.")
+    parser.add_argument("-f", "--fuzzy", action="store_true", help="Enable fuzzy matching.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print recognizer log messages.")
+    args = parser.parse_args()
+
+    reports = []
+    for spec in args.recognizers:
+        print(f"Benchmarking {spec}")
+
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            try:
+                report = executor.submit(benchRecognizer, spec, args.corpus, args.profile, args.fuzzy, args.verbose).result()
+            except Exception:
+                print(format_exc())
+                reports.append({"recognizer": spec, "error": format_exc()})
+                continue
+
+        reports.append(report)
+        print(f'  rtf {report["realTimeFactor"]:.3f}, latency p50 {report["latency"]["p50"] * 1000:.0f} ms p95 {report["latency"]["p95"] * 1000:.0f} ms, load {report["loadTime"]:.1f}s, peak memory {report["peakMemory"]} MB')
+        print(f'  precision {report["precision"]:.3f}, recall {report["recall"]:.3f}, accuracy {report["accuracy"]:.3f} over {report["files"]} files')
+        if not report["tiers"] is None:
+            print(f'  decided by {report["tiers"]["tiers"]["fast"]} {report["tiers"]["fast"]}, {report["tiers"]["tiers"]["slow"]} {report["tiers"]["slow"]}, no match {report["tiers"]["none"]}')
+
+    with open(args.output, "w") as fileW:
+        dump({"time": time(), "corpus": args.corpus, "profile": args.profile, "fuzzy": args.fuzzy, "reports": reports}, fileW, indent=4)
+
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
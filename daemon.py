@@ -0,0 +1,70 @@
+import signal
+from argparse import ArgumentParser
+from time import sleep
+from traceback import format_exc
+from types import SimpleNamespace
+
+from lib import Config, LogEmitter, Profile, VCEngine, allSources
+
+
+def main():
+    parser = ArgumentParser(description="Run Voice Commander without the GUI, using the settings from config.json.")
+    parser.add_argument("-p", "--profile", default="", help="Profile to use instead of the profile selected in config.json, without .json. config.json is not changed.")
+    parser.add_argument("-l", "--log-file", default=None, help="Also write the log to this file, rotated at 1 MB.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Don't write the log to stdout.")
+    parser.add_argument("-s", "--source", choices=allSources, default=None, help="Audio source to listen to instead of the one in config.json.")
+    parser.add_argument("--file", default=None, help="Audio file (wav, flac or aiff) for the file source.")
+    parser.add_argument("--speed", type=float, default=None, help="Playback speed of the file source, 0 plays as fast as the recognizer keeps up without dropping phrases.")
+    parser.add_argument("--loop", action="store_true", help="Replay the file source when it ends instead of stopping.")
+    parser.add_argument("--rate", type=int, default=None, help="Sample rate of the raw 16-bit mono PCM for the stdin and socket sources.")
+    parser.add_argument("--socket", default=None, help="Path of the UNIX socket for the socket source.")
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in (("Audio source", args.source), ("Audio file", args.file), ("Audio speed", args.speed), ("Audio rate", args.rate), ("Audio socket", args.socket)) if not value is None}
+    if args.loop:
+        overrides["Audio loop"] = True
+
+    signals = SimpleNamespace(log=LogEmitter(args.log_file, not args.quiet))
+
+    profile = f"{args.profile}.json" if args.profile != "" else Profile.getProfile()
+    if not profile in Profile.list() and args.profile != "":
+        parser.error(f"Profile {args.profile} not present! Available profiles: {', '.join(Profile.listShort())}")
+
+    if not profile in Profile.list():
+        if len(Profile.list()) == 0:
+            Profile.new("Default.json")
+
+        signals.log.emit(f"Profile {profile} from config.json not present, using {Profile.list()[0]}.", "Orange")
+        profile = Profile.list()[0]
+
+    Profile.setProfile(profile, persist=False)
+    engine = VCEngine(Config, Profile, overrides)
+
+    def handleStop(signum, frame):
+        engine.stop = True
+
+    def handleReload(signum, frame):
+        signals.log.emit("Reloading config and profile.", "Yellow")
+        engine.reload()
+
+    signal.signal(signal.SIGINT, handleStop)
+    signal.signal(signal.SIGTERM, handleStop)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, handleReload)
+
+    signals.log.emit("Starting Voice Commander daemon", "Yellow")
+
+    while not engine.stop:
+        try:
+            engine.run(signals)
+        except Exception:
+            signals.log.emit(format_exc(), "Red")
+            sleep(1)
+
+    engine.quit()
+    signals.log.emit("Stopped Voice Commander daemon", "Yellow")
+    signals.log.close()
+
+
+if __name__ == "__main__":
+    main()
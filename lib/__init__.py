@@ -1,21 +1,52 @@
-from . import templates as tpl
-from .general import Config, Profile, Worker, ignoreStderr
-from .recognizers import sphinx, vosk, whisper
+from . import general
+from .audio import AudioStream, AudioStreamSource, VoiceActivityDetector
+from .engine import VCEngine
+from .general import Worker, ignoreStderr, startup
+from .logs import LogBuffer, LogEmitter
+from .macros import MacroExecutor, compileMacro, compileProfile
+from .matcher import CommandMatcher
+from .metrics import Metrics, markTrace
+from .pipeline import Pipeline, StageQueue
+from .recognizers import allRecognizers, loadRecognizer
+from .sources import allSources, createSource
 
-Config = Config()
-Profile = Profile()
+startup.mark("imports")
 
-allRecognizers = {
-    "vosk": {"recognizer": vosk, "options": ("Model",)},
-    "whisper": {"recognizer": whisper, "options": ("Language", "Model")},
-    "sphinx": {"recognizer": sphinx, "options": ()},
-}
+
+def __getattr__(name: str):
+    if name == "Config":
+        globals()["Config"] = general.Config()
+        startup.mark("config")
+        return globals()["Config"]
+
+    if name == "Profile":
+        globals()["Profile"] = general.Profile(globals()["Config"] if "Config" in globals() else __getattr__("Config"))
+        return globals()["Profile"]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = (
+    "AudioStream",
+    "AudioStreamSource",
+    "VoiceActivityDetector",
     "Config",
     "Profile",
     "Worker",
+    "CommandMatcher",
+    "LogBuffer",
+    "LogEmitter",
+    "Metrics",
+    "markTrace",
+    "compileMacro",
+    "compileProfile",
+    "MacroExecutor",
+    "Pipeline",
+    "StageQueue",
     "ignoreStderr",
-    "tpl",
+    "VCEngine",
     "allRecognizers",
+    "loadRecognizer",
+    "allSources",
+    "createSource",
+    "startup",
 )
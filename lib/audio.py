@@ -0,0 +1,335 @@
+from collections import deque
+from threading import Condition, Thread
+from weakref import WeakSet
+from time import perf_counter
+
+import numpy
+from speech_recognition import AudioData, AudioSource, Microphone, WaitTimeoutError
+
+from .general import ignoreStderr
+
+
+class AudioStream:
+    def __init__(self, device: AudioSource, bufferTime: int = 30):
+        self.device = device
+        self.bufferTime = bufferTime
+
+        self.buffer = None
+        self.written = 0
+        self.condition = Condition()
+        self.readers = WeakSet()
+        self.blocking = not getattr(device, "live", True)
+
+        self.stop = False
+        self.error = None
+        self.thread = None
+
+    def open(self):
+        with ignoreStderr():
+            self.device.__enter__()
+
+        self.SAMPLE_RATE = self.device.SAMPLE_RATE
+        self.SAMPLE_WIDTH = self.device.SAMPLE_WIDTH
+        self.CHUNK = self.device.CHUNK
+
+        self.buffer = deque(maxlen=max(1, int(self.bufferTime * self.SAMPLE_RATE / self.CHUNK)))
+
+        self.thread = Thread(target=self._capture, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def close(self):
+        with self.condition:
+            self.stop = True
+            self.condition.notify_all()
+
+        if not self.thread is None:
+            self.thread.join(1)
+
+        with ignoreStderr():
+            self.device.__exit__(None, None, None)
+
+        with self.condition:
+            self.condition.notify_all()
+
+    def isAlive(self):
+        return not self.thread is None and self.thread.is_alive()
+
+    def _capture(self):
+        while not self.stop:
+            try:
+                chunk = self.device.stream.read(self.CHUNK)
+            except (AttributeError, OSError, EOFError) as err:
+                self.error = err
+                break
+
+            with self.condition:
+                if self.blocking:
+                    self.condition.wait_for(lambda: self.stop or all(self.written - reader.position < self.buffer.maxlen for reader in self.readers))
+
+                self.buffer.append(chunk)
+                self.written += 1
+                self.condition.notify_all()
+
+        with self.condition:
+            self.stop = True
+            self.condition.notify_all()
+
+    def reader(self, timeout: float = 1):
+        reader = AudioStreamReader(self, timeout)
+        with self.condition:
+            self.readers.add(reader)
+
+        return reader
+
+
+class AudioStreamReader:
+    def __init__(self, stream: AudioStream, timeout: float = 1):
+        self.stream = stream
+        self.timeout = timeout
+        self.dropped = 0
+        self.position = stream.written - len(stream.buffer) if stream.blocking else stream.written
+
+    def _wait(self):
+        self.stream.condition.wait_for(lambda: self.position < self.stream.written or self.stream.stop, self.timeout)
+        if self.position >= self.stream.written and isinstance(self.stream.error, EOFError):
+            raise EOFError(str(self.stream.error))
+
+        if self.position >= self.stream.written:
+            raise OSError(f"Audio stream stopped delivering audio! {self.stream.error or ''}".strip())
+
+        oldest = self.stream.written - len(self.stream.buffer)
+        if self.position < oldest:
+            self.dropped += oldest - self.position
+            self.position = oldest
+
+        return oldest
+
+    def read(self, size: int = None):
+        with self.stream.condition:
+            oldest = self._wait()
+
+            chunk = self.stream.buffer[self.position - oldest]
+            self.position += 1
+            self.stream.condition.notify_all()
+
+            return chunk
+
+    def readAvailable(self):
+        with self.stream.condition:
+            oldest = self._wait()
+
+            chunks = tuple(self.stream.buffer[i - oldest] for i in range(self.position, self.stream.written))
+            self.position = self.stream.written
+            self.stream.condition.notify_all()
+
+            return b"".join(chunks)
+
+
+class AudioStreamSource(AudioSource):
+    def __init__(self, stream: AudioStream):
+        self.SAMPLE_RATE = stream.SAMPLE_RATE
+        self.SAMPLE_WIDTH = stream.SAMPLE_WIDTH
+        self.CHUNK = stream.CHUNK
+
+        self.stream = stream.reader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+def toFloat32(frameData: bytes, sampleRate: int, sampleWidth: int, targetRate: int = 16000):
+    samples = numpy.frombuffer(frameData, dtype={1: numpy.int8, 2: numpy.int16, 4: numpy.int32}[sampleWidth]).astype(numpy.float32) / float(2 ** (sampleWidth * 8 - 1))
+
+    if sampleRate == targetRate or len(samples) == 0:
+        return samples
+
+    return numpy.interp(numpy.arange(int(len(samples) * targetRate / sampleRate)) * (sampleRate / targetRate), numpy.arange(len(samples)), samples).astype(numpy.float32)
+
+
+def runEnd(flags, length: int, carry: int = 0):
+    carry = min(carry, length - 1)
+    padded = numpy.concatenate((numpy.ones(carry, dtype=numpy.int32), flags.astype(numpy.int32)))
+    if len(padded) < length:
+        return -1
+
+    hits = numpy.flatnonzero(numpy.convolve(padded, numpy.ones(length, dtype=numpy.int32), "valid") == length)
+    return -1 if len(hits) == 0 else int(hits[0]) + length - 1 - carry
+
+
+def trailingRun(flags, carry: int = 0):
+    misses = numpy.flatnonzero(~flags)
+    return carry + len(flags) if len(misses) == 0 else len(flags) - 1 - int(misses[-1])
+
+
+class VoiceActivityDetector:
+    def __init__(self, source: AudioStreamSource, threshold: int = 3, hangover: int = 500, preRoll: int = 300, minSpeech: int = 200, frameTime: int = 10):
+        self.source = source
+        self.SAMPLE_RATE = source.SAMPLE_RATE
+
+        self.frameLength = max(1, source.CHUNK // max(1, round(source.CHUNK * 1000 / source.SAMPLE_RATE / frameTime)))
+        self.frameTime = self.frameLength * 1000 / self.SAMPLE_RATE
+        self.startFrames = max(1, round(30 / self.frameTime))
+        self.maxZeroCrossings = 0.35
+
+        self.noiseFloor = 0.001
+        self.level = 0.0
+        self.timestamps = {}
+
+        self.configure(threshold, hangover, preRoll, minSpeech)
+        self.reset()
+
+    def configure(self, threshold: int, hangover: int, preRoll: int, minSpeech: int):
+        self.threshold = max(1, threshold)
+        self.hangoverFrames = max(1, round(hangover / self.frameTime))
+        self.preRollSamples = max(0, int(preRoll * self.SAMPLE_RATE / 1000))
+        self.minSpeechFrames = max(1, round(minSpeech / self.frameTime))
+
+    def reset(self):
+        self.phrase = None
+        self.phraseStart = None
+        self.phraseLength = 0
+        self.speechFrames = 0
+        self.speechRun = 0
+        self.silenceRun = 0
+        self.preRoll = numpy.zeros(0, dtype=numpy.int16)
+        self.remainder = numpy.zeros(0, dtype=numpy.int16)
+
+    def classify(self, samples):
+        frames = samples[: len(samples) // self.frameLength * self.frameLength].astype(numpy.float32).reshape(-1, self.frameLength) / 32768
+        energy = numpy.sqrt(numpy.mean(numpy.square(frames), axis=1))
+        zeroCrossings = numpy.mean(numpy.signbit(frames[:, 1:]) != numpy.signbit(frames[:, :-1]), axis=1)
+
+        threshold = self.noiseFloor * self.threshold
+        return energy, (energy > threshold) & ((zeroCrossings < self.maxZeroCrossings) | (energy > threshold * 3))
+
+    def calibrate(self, duration: float = 3):
+        samples = []
+        while sum(len(block) for block in samples) < duration * self.SAMPLE_RATE:
+            samples.append(numpy.frombuffer(self.source.stream.readAvailable(), dtype=numpy.int16))
+
+        energy, _ = self.classify(numpy.concatenate(samples))
+        self.noiseFloor = max(float(numpy.percentile(energy, 90)), 0.0001)
+        self.reset()
+
+    def listen(self, timeout: float = None, phraseTime: float = 0):
+        waited = 0
+
+        while True:
+            samples = self.remainder if len(self.remainder) >= self.source.CHUNK else numpy.concatenate((self.remainder, numpy.frombuffer(self.source.stream.readAvailable(), dtype=numpy.int16)))
+            energy, flags = self.classify(samples)
+            self.level = float(energy.max()) if len(energy) > 0 else self.level
+            samples, self.remainder = samples[: len(flags) * self.frameLength], samples[len(flags) * self.frameLength :]
+
+            if self.phrase is None:
+                end = runEnd(flags, self.startFrames, self.speechRun)
+                if end < 0:
+                    self.speechRun = trailingRun(flags, self.speechRun)
+                    if (~flags).any():
+                        self.noiseFloor = max(0.95 * self.noiseFloor + 0.05 * float(numpy.median(energy[~flags])), 0.0001)
+                    self.preRoll = numpy.concatenate((self.preRoll, samples))[max(0, len(self.preRoll) + len(samples) - self.preRollSamples) :]
+
+                    waited += len(samples)
+                    if not timeout is None and waited >= timeout * self.SAMPLE_RATE:
+                        raise WaitTimeoutError("listening timed out while waiting for phrase to start")
+                    continue
+
+                start = max(0, end - self.startFrames + 1)
+                self.phraseStart = perf_counter()
+                self.phrase = [numpy.concatenate((self.preRoll, samples[: start * self.frameLength]))[-self.preRollSamples :] if self.preRollSamples > 0 else self.preRoll[:0]]
+                self.speechRun = 0
+                self.silenceRun = 0
+                samples, flags = samples[start * self.frameLength :], flags[start:]
+
+            end = runEnd(~flags, self.hangoverFrames, self.silenceRun)
+            ended = end >= 0
+            if not ended:
+                self.silenceRun = trailingRun(~flags, self.silenceRun)
+                end = len(flags) - 1
+
+            self.phrase.append(samples[: (end + 1) * self.frameLength])
+            self.phraseLength += (end + 1) * self.frameLength
+            self.speechFrames += int(flags[: end + 1].sum())
+
+            if not ended and (phraseTime <= 0 or self.phraseLength < phraseTime * self.SAMPLE_RATE):
+                continue
+
+            phrase, speechFrames, remainder = numpy.concatenate(self.phrase), self.speechFrames, self.remainder
+            self.timestamps = {"speech start": self.phraseStart, "phrase end": perf_counter()}
+            self.reset()
+            self.remainder = numpy.concatenate((samples[(end + 1) * self.frameLength :], remainder))
+
+            if speechFrames >= self.minSpeechFrames:
+                return AudioData(phrase.tobytes(), self.SAMPLE_RATE, 2)
+
+
+class MicrophoneListener:
+    def __init__(self, name: str, deviceIndex: int, signals: object, submit: object, vadOptions: tuple = (3, 500, 300, 200), phraseTime: float = 0):
+        self.name = name
+        self.deviceIndex = deviceIndex
+        self.signals = signals
+        self.submit = submit
+
+        self.vadOptions = vadOptions
+        self.phraseTime = phraseTime
+
+        self.stream = None
+        self.source = None
+        self.vad = None
+
+        self.calibrateRequested = True
+        self.stop = False
+        self.thread = None
+
+    def open(self):
+        self.stream = AudioStream(Microphone(self.deviceIndex)).open()
+        self.source = AudioStreamSource(self.stream)
+        self.vad = VoiceActivityDetector(self.source, *self.vadOptions)
+
+        self.thread = Thread(target=self._run, name=f"Listener {self.name}", daemon=True)
+        self.thread.start()
+
+        return self
+
+    def configure(self, vadOptions: tuple, phraseTime: float):
+        self.vadOptions = vadOptions
+        self.phraseTime = phraseTime
+
+        if not self.vad is None:
+            self.vad.configure(*vadOptions)
+
+    def close(self):
+        self.stop = True
+
+        if not self.thread is None:
+            self.thread.join(2)
+
+        if not self.stream is None:
+            self.stream.close()
+
+    def isAlive(self):
+        return not self.thread is None and self.thread.is_alive()
+
+    def stats(self):
+        return {"name": self.name, "level": 0.0 if self.vad is None else self.vad.level, "dropped": 0 if self.source is None else self.source.stream.dropped, "alive": self.isAlive()}
+
+    def _run(self):
+        while not self.stop:
+            try:
+                if self.calibrateRequested:
+                    self.calibrateRequested = False
+                    self.vad.calibrate(3)
+                    self.signals.log.emit(f"Listening to microphone: {self.name}", "Green")
+
+                audio = self.vad.listen(timeout=1, phraseTime=self.phraseTime)
+            except (WaitTimeoutError, AssertionError):
+                continue
+            except (AttributeError, OSError) as err:
+                self.signals.log.emit(f"Stopped listening to microphone: {self.name}; {err}", "Red")
+                break
+
+            self.submit(self.name, audio, self.vad.timestamps)
@@ -0,0 +1,328 @@
+from threading import Lock, Thread
+from time import sleep
+from traceback import format_exc
+
+from pynput.keyboard import Controller
+from speech_recognition import Microphone, WaitTimeoutError
+
+from .audio import AudioStream, AudioStreamSource, MicrophoneListener, VoiceActivityDetector
+from .general import ignoreStderr, startup
+from .macros import MacroExecutor, compileProfile
+from .matcher import CommandMatcher
+from .metrics import Metrics, markTrace
+from .pipeline import Pipeline
+from .recognizers import loadRecognizer
+from .sources import createSource
+
+
+class VCEngine:
+    def __init__(self, config: object, profile: object, overrides: dict = {}):
+        self.config = config
+        self.profile = profile
+        self.overrides = dict(overrides)
+
+        self.stop = False
+
+        self.currentConfig = {}
+        self.currentProfile = {}
+        self.matcher = CommandMatcher(())
+
+        self.updateAll = False
+        self.updateRecognizer = False
+        self.updateMicrophone = False
+        self.updateListeners = False
+        self.currentRecognizer = None
+        self.currentStream = None
+        self.currentSource = None
+        self.sourceKey = None
+        self.vad = None
+        self.listeners = {}
+        self.ended = False
+
+        self.signals = None
+        self.pipeline = None
+        self.executor = None
+
+        self.metrics = Metrics()
+        self.metricsKey = ""
+        self.recognizerGeneration = 0
+        self.pendingRecognizer = None
+        self.pendingLock = Lock()
+
+        self.keyboard = Controller()
+
+    def run(self, signals):
+        self.signals = signals
+
+        self.updateConfig()
+        self.updateProfile()
+        startup.mark("profile")
+        self.doUpdateRecognizer()
+        self.doUpdateMicrophone()
+        startup.mark("microphone")
+
+        self.executor = MacroExecutor(
+            signals, self.keyboard, policy=self.currentConfig["Macro policy"], coalesceTime=self.currentConfig["Macro coalesce"], queueSize=self.currentConfig["Queue size"], backpressure=self.currentConfig["Backpressure"], onTrace=self.metrics.record
+        ).start()
+        self.pipeline = Pipeline(
+            signals, self.recognize, self.parseCommand, self.executor.submit, queueSize=self.currentConfig["Queue size"], policy=self.currentConfig["Backpressure"], workers=self.currentConfig["Recognizer workers"], onTrace=self.metrics.record, dedupWindow=self.currentConfig["Dedup window"]
+        ).start()
+        self.doUpdateListeners()
+        self.metrics.dumpEvery(f"{self.config.workFolder}/metrics.json", self.currentConfig["Metrics dump"])
+
+        startup.mark("pipeline")
+
+        if not startup.reported:
+            report = startup.report()
+            signals.log.emit(report, "White")
+
+        try:
+            while not self.stop:
+                while not self.stop and (self.currentSource is None or self.currentConfig == {}):
+                    sleep(0.1)
+
+                if self.updateAll:
+                    self.updateAll = False
+                    microphones = (self.currentConfig["Microphone"], self.currentConfig["Extra microphones"])
+                    self.profile.reload()
+                    self.updateConfig()
+                    self.updateProfile()
+                    self.updateRecognizer = True
+                    self.updateMicrophone = self.updateMicrophone or (self.currentConfig["Microphone"], self.currentConfig["Extra microphones"]) != microphones
+
+                if self.updateRecognizer:
+                    self.updateRecognizer = False
+                    self.doUpdateRecognizer()
+
+                with self.pendingLock:
+                    pending, self.pendingRecognizer = self.pendingRecognizer, None
+
+                if not pending is None and pending[0] == self.recognizerGeneration:
+                    self.swapRecognizer(*pending[1])
+
+                if self.updateMicrophone:
+                    self.updateMicrophone = False
+                    self.doUpdateMicrophone()
+
+                if self.updateListeners:
+                    self.updateListeners = False
+                    for listener in tuple(self.listeners.values()):
+                        listener.configure((self.currentConfig["Vad threshold"], self.currentConfig["Vad hangover"], self.currentConfig["Vad pre-roll"], self.currentConfig["Vad min speech"]), self.currentConfig["Phrase time"])
+
+                if self.currentRecognizer is None:
+                    sleep(0.1)
+                    continue
+
+                try:
+                    if getattr(self.currentRecognizer, "streaming", False):
+                        chunk = self.currentSource.stream.read()
+                        trace = markTrace({"recognizer": self.metricsKey}, "recognize start")
+                        command = self.currentRecognizer.feed(chunk, self.currentSource.SAMPLE_RATE)
+                        if not command is None and command != "":
+                            self.pipeline.dispatch(command, markTrace(trace, "recognize end"))
+                        continue
+
+                    audio = self.vad.listen(timeout=1, phraseTime=self.currentConfig["Phrase time"])
+                except (WaitTimeoutError, AssertionError):
+                    sleep(0.1)
+                    continue
+                except EOFError:
+                    self.updateMicrophone = True
+                    continue
+                except (AttributeError, OSError):
+                    print(format_exc())
+                    self.updateMicrophone = True
+                    continue
+
+                self.submitPhrase(self.currentConfig["Microphone"] if self.currentConfig["Audio source"] == "microphone" else self.currentConfig["Audio source"], audio, self.vad.timestamps)
+        finally:
+            for listener in self.listeners.values():
+                listener.close()
+            self.listeners = {}
+
+            self.pipeline.close(drain=self.ended)
+            self.executor.close(drain=self.ended)
+            self.metrics.close()
+
+        if not self.currentStream is None:
+            self.currentStream.close()
+
+    def updateConfig(self):
+        self.currentConfig = {**self.config.get(), **self.overrides}
+        if self.currentConfig["Audio source"] == "file" and self.currentConfig["Audio speed"] <= 0:
+            self.currentConfig["Backpressure"] = "block"
+        if not self.pipeline is None:
+            self.pipeline.configure(self.currentConfig["Queue size"], self.currentConfig["Backpressure"], self.currentConfig["Dedup window"])
+        if not self.executor is None:
+            self.executor.configure(self.currentConfig["Macro policy"], self.currentConfig["Macro coalesce"], self.currentConfig["Queue size"], self.currentConfig["Backpressure"])
+        if not self.vad is None:
+            self.vad.configure(self.currentConfig["Vad threshold"], self.currentConfig["Vad hangover"], self.currentConfig["Vad pre-roll"], self.currentConfig["Vad min speech"])
+        self.updateListeners = True
+        self.signals.log.emit(f"Loaded config", "Green")
+
+    def updateProfile(self):
+        self.currentProfile = self.profile.get()
+        self.matcher = CommandMatcher(compileProfile(self.currentProfile), fuzzy=self.currentConfig["Fuzzy matching"])
+        if hasattr(self.currentRecognizer, "updateProfile"):
+            self.currentRecognizer.updateProfile(self.currentProfile)
+        self.signals.log.emit(f"Loaded profile: {self.profile.getShortProfile()}", "Green")
+
+    def doUpdateRecognizer(self):
+        self.recognizerGeneration += 1
+
+        if self.currentRecognizer is None:
+            try:
+                self.swapRecognizer(*self.buildRecognizer(self.currentConfig))
+            except Exception:
+                print(format_exc())
+                self.signals.log.emit(f"Failed to load recognizer: {self.currentConfig['Speach Recognizer']}", "Red")
+            return None
+
+        self.signals.log.emit(f"Loading recognizer {self.currentConfig['Speach Recognizer']} in the background, {self.metricsKey} keeps listening.", "Yellow")
+        Thread(target=self._loadRecognizer, args=(self.recognizerGeneration, dict(self.currentConfig)), name="Recognizer loader", daemon=True).start()
+
+    def buildRecognizer(self, config: dict):
+        recognizerName = config["Speach Recognizer"]
+        recognizer = loadRecognizer(recognizerName)
+        startup.mark("recognizer import")
+
+        recognizer = recognizer(signals=self.signals, config=config, profile=self.profile.get())
+        if hasattr(recognizer, "warmUp"):
+            recognizer.warmUp()
+        startup.mark("recognizer init")
+
+        return recognizer, f'{recognizerName}:{config[f"{recognizerName}:Model"]}' if f"{recognizerName}:Model" in config else recognizerName
+
+    def _loadRecognizer(self, generation: int, config: dict):
+        try:
+            loaded = self.buildRecognizer(config)
+        except Exception:
+            print(format_exc())
+            self.signals.log.emit(f"Failed to load recognizer {config['Speach Recognizer']}, keeping {self.metricsKey}!", "Red")
+            return None
+
+        with self.pendingLock:
+            if generation == self.recognizerGeneration:
+                self.pendingRecognizer = (generation, loaded)
+
+    def swapRecognizer(self, recognizer: object, metricsKey: str):
+        profile = self.currentProfile
+        if hasattr(recognizer, "updateProfile"):
+            recognizer.updateProfile(profile)
+
+        self.currentRecognizer, self.metricsKey = recognizer, metricsKey
+
+        if hasattr(recognizer, "updateProfile") and not self.currentProfile is profile:
+            recognizer.updateProfile(self.currentProfile)
+        self.signals.log.emit(f"Loaded recognizer: {metricsKey}", "Green")
+
+        if not self.pipeline is None:
+            self.doUpdateListeners()
+
+    def doUpdateMicrophone(self):
+        sourceName = self.currentConfig["Audio source"]
+
+        deviceIndex = None
+        if sourceName == "microphone":
+            with ignoreStderr():
+                deviceIndex = tuple(i for i, mic in enumerate(Microphone.list_microphone_names()) if mic == self.currentConfig["Microphone"])[0]
+
+        sourceKey = (sourceName, deviceIndex) if sourceName == "microphone" else (sourceName, *(self.currentConfig[key] for key in ("Audio file", "Audio speed", "Audio loop", "Audio rate", "Audio socket")))
+
+        if not self.currentStream is None and isinstance(self.currentStream.error, EOFError) and self.sourceKey == sourceKey:
+            self.signals.log.emit(f"Audio source {sourceName} ended; {self.currentStream.error}", "Yellow")
+            self.ended = True
+            self.stop = True
+            return None
+
+        if self.currentStream is None or not self.currentStream.isAlive() or self.sourceKey != sourceKey:
+            try:
+                newStream = AudioStream(createSource(self.currentConfig, deviceIndex)).open()
+            except (AttributeError, OSError, ValueError) as err:
+                if sourceName != "microphone":
+                    self.signals.log.emit(f"Failed to open audio source {sourceName}; {err}", "Red")
+                    self.stop = True
+                    return None
+
+                with ignoreStderr():
+                    spoofedMicrophone = tuple(mic for mic in Microphone.list_microphone_names() if "default" in mic)[0]
+                self.config.set("Microphone", spoofedMicrophone)
+                self.signals.log.emit(f"Failed to select microphone: {spoofedMicrophone}", "Red")
+
+                self.updateConfig()
+                self.updateMicrophone = True
+
+                return None
+
+            if not self.currentStream is None:
+                self.currentStream.close()
+
+            self.currentStream = newStream
+            self.currentSource = AudioStreamSource(newStream)
+            self.sourceKey = sourceKey
+            self.vad = VoiceActivityDetector(self.currentSource, self.currentConfig["Vad threshold"], self.currentConfig["Vad hangover"], self.currentConfig["Vad pre-roll"], self.currentConfig["Vad min speech"])
+
+        if getattr(self.currentStream.device, "live", True):
+            self.vad.calibrate(3)
+
+        self.signals.log.emit(f"Listening to microphone: {self.currentConfig['Microphone']}" if sourceName == "microphone" else f"Listening to audio source: {sourceName}", "Green")
+
+        if not self.pipeline is None:
+            for listener in self.listeners.values():
+                listener.calibrateRequested = True
+            self.doUpdateListeners()
+
+    def doUpdateListeners(self):
+        names = tuple(name for name in self.currentConfig["Extra microphones"] if name != self.currentConfig["Microphone"] or self.currentConfig["Audio source"] != "microphone")
+        if len(names) > 0 and getattr(self.currentRecognizer, "streaming", False):
+            self.signals.log.emit(f"Extra microphones are not used with the streaming recognizer {self.currentConfig['Speach Recognizer']}.", "Orange")
+            names = ()
+
+        for name in tuple(self.listeners):
+            if not name in names or not self.listeners[name].isAlive():
+                self.listeners.pop(name).close()
+
+        if all(name in self.listeners for name in names):
+            return None
+
+        with ignoreStderr():
+            microphones = Microphone.list_microphone_names()
+
+        for name in names:
+            if name in self.listeners:
+                continue
+
+            if not name in microphones:
+                self.signals.log.emit(f"Failed to select microphone: {name}", "Red")
+                continue
+
+            vadOptions = (self.currentConfig["Vad threshold"], self.currentConfig["Vad hangover"], self.currentConfig["Vad pre-roll"], self.currentConfig["Vad min speech"])
+            try:
+                self.listeners[name] = MicrophoneListener(name, microphones.index(name), self.signals, self.submitPhrase, vadOptions, self.currentConfig["Phrase time"]).open()
+            except (AttributeError, OSError):
+                self.signals.log.emit(f"Failed to select microphone: {name}", "Red")
+
+    def submitPhrase(self, device: str, audio, timestamps: dict):
+        self.pipeline.submit(audio, {"recognizer": self.metricsKey, "device": device, **timestamps})
+
+    def deviceStats(self):
+        stats = [] if self.vad is None else [{"name": self.currentConfig["Microphone"] if self.currentConfig["Audio source"] == "microphone" else self.currentConfig["Audio source"], "level": self.vad.level, "dropped": self.currentSource.stream.dropped, "alive": not self.currentStream is None and self.currentStream.isAlive()}]
+        return stats + [listener.stats() for listener in tuple(self.listeners.values())]
+
+    def recognize(self, audio):
+        return self.currentRecognizer.run(audio)
+
+    def parseCommand(self, command: str):
+        record = self.matcher.record(command)
+        if record is None:
+            return None
+
+        return record["events"]
+
+    def reload(self):
+        self.updateAll = True
+
+    def quit(self):
+        self.stop = True
+        self.profile.flush()
+        self.metrics.close()
@@ -2,36 +2,83 @@ import os
 import sys
 from contextlib import contextmanager
 from json import dump, load
+from threading import RLock, Timer
+from time import perf_counter
 from traceback import format_exc
 
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
 from speech_recognition import Microphone
 
 
+def defaultConfig(microphone: str = ""):
+    return {"Profile": "Default.json", "Microphone": microphone, "Extra microphones": [], "Audio source": "microphone", "Audio file": "", "Audio speed": 1.0, "Audio loop": False, "Audio rate": 16000, "Audio socket": "/tmp/voicecommander.sock", "Phrase time": 2, "Vad threshold": 3, "Vad hangover": 500, "Vad pre-roll": 300, "Vad min speech": 200, "Queue size": 4, "Backpressure": "drop oldest", "Recognizer workers": 1, "Dedup window": 1000, "Macro policy": "sequential", "Macro coalesce": 500, "Fuzzy matching": False, "Log lines": 1000, "Log file": False, "Metrics dump": 60, "Speach Recognizer": "vosk", "vosk:Model": "small-en", "vosk-stream:Model": "small-en", "whisper:Language": "english", "whisper:Model": "tiny", "whisper:Memory": 4096, "whisper:Beam size": 0, "cascade:Fast": "vosk", "cascade:Slow": "whisper", "cascade:Fast timeout": 2000, "cascade:Slow timeout": 10000, "cascade:Min confidence": 0.6}
+
+
+def mergeValue(default: any, stored: any):
+    if type(default) is float and type(stored) is int:
+        return float(stored)
+
+    return stored if type(stored) is type(default) else default
+
+
+def mergeConfig(defaults: dict, stored: dict):
+    return {key: mergeValue(default, stored.get(key)) for key, default in defaults.items()}
+
+
+def readConfig(path: str):
+    if not os.path.exists(path):
+        return defaultConfig()
+
+    with open(path, "r") as fileR:
+        return mergeConfig(defaultConfig(), load(fileR))
+
+
 class Config:
     def __init__(self):
         self.workFolder = os.path.split(__file__)[0].replace("\\", "/").replace("/lib", "")
 
         with ignoreStderr():
             microphones = Microphone.list_microphone_names()
-        defaultMic = tuple(mic for mic in microphones if "default" in mic)[0]
+        defaultMic = next((mic for mic in microphones if "default" in mic), microphones[0] if len(microphones) > 0 else "")
 
-        self.defaultConfig = {"Profile": "Default.json", "Microphone": defaultMic, "Phrase time": 2, "Speach Recognizer": "vosk", "vosk:Model": "small-en", "whisper:Language": "english", "whisper:Model": "tiny"}
+        self.defaultConfig = defaultConfig(defaultMic)
 
-        if not os.path.exists(f"{self.workFolder}/config.json"):
-            with open(f"{self.workFolder}/config.json", "w") as fileW:
-                dump(self.defaultConfig, fileW, indent=4)
+        self.path = f"{self.workFolder}/config.json"
+        self.lock = RLock()
+        self.cache = None
+        self.cacheStat = None
+        self.batchDepth = 0
+        self.dirty = False
 
-        with open(f"{self.workFolder}/config.json", "r") as fileR:
-            if tuple(load(fileR)) == tuple(self.defaultConfig):
-                return None
+        if not os.path.exists(self.path):
+            dumpAtomic(self.defaultConfig, self.path)
+
+        storedConfig = self.get()
+        if tuple(storedConfig) == tuple(self.defaultConfig):
+            return None
 
-        with open(f"{self.workFolder}/config.json", "w") as fileW:
-            dump(self.defaultConfig, fileW, indent=4)
+        with self.lock:
+            self.cache = mergeConfig(self.defaultConfig, storedConfig)
+            self._write()
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _write(self):
+        dumpAtomic(self.cache, self.path)
+        self.cacheStat = self._stat()
 
     def get(self):
-        with open(f"{self.workFolder}/config.json", "r") as fileR:
-            return load(fileR)
+        with self.lock:
+            if self.batchDepth == 0 or self.cache is None:
+                stat = self._stat()
+                if self.cache is None or stat != self.cacheStat:
+                    with open(self.path, "r") as fileR:
+                        self.cache = load(fileR)
+                    self.cacheStat = stat
+
+            return dict(self.cache)
 
     def set(self, key: str, value: any):
         if not key in self.defaultConfig:
@@ -40,29 +87,55 @@ class Config:
         if not type(value) is type(self.defaultConfig[key]):
             raise ValueError(f"Value type incorrect! {type(self.defaultConfig[key])} != {type(value)}")
 
-        currentConfig = self.get()
-        currentConfig[key] = value
-        with open(f"{self.workFolder}/config.json", "w") as fileW:
-            dump(currentConfig, fileW, indent=4)
+        with self.lock:
+            currentConfig = self.get()
+            currentConfig[key] = value
+            self.cache = currentConfig
+
+            if self.batchDepth > 0:
+                self.dirty = True
+                return None
+
+            self._write()
+
+    @contextmanager
+    def batch(self):
+        with self.lock:
+            self.batchDepth += 1
+
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batchDepth -= 1
+                if self.batchDepth == 0 and self.dirty:
+                    self.dirty = False
+                    self._write()
 
 
 class Profile:
-    def __init__(self):
+    def __init__(self, config: Config):
         self.workFolder = os.path.split(__file__)[0].replace("\\", "/").replace("/lib", "")
 
         if not os.path.exists(f"{self.workFolder}/profiles"):
             os.makedirs(f"{self.workFolder}/profiles")
 
-        self.config = Config()
+        self.config = config
+        self.override = None
 
-        self.defaultProfile = {"voiceCommands": []}
+        self.defaultProfile = {"voiceCommands": [], "keyDelay": 100}
         self.voiceCommandsTemplate = {"command": str, "macro": str, "sensitivity": int}
 
+        self.lock = RLock()
+        self.cache = None
+        self.dirty = False
+        self.flushTimer = None
+        self.flushDelay = 1
+
         if len(os.listdir(f"{self.workFolder}/profiles")) == 0:
-            with open(f"{self.workFolder}/profiles/Default.json", "w") as fileW:
-                dump(self.defaultProfile, fileW, indent=4)
+            dumpAtomic(self.defaultProfile, f"{self.workFolder}/profiles/Default.json")
 
-            self.config.set("Profile", "default")
+            self.config.set("Profile", "Default.json")
 
     def _voiceCommandsVerifyRecord(self, record):
         if not type(record) is dict:
@@ -72,23 +145,34 @@ class Profile:
             raise ValueError(f"Dict format incorrect! {dict({k: type(record[k]) for k in record})} != {self.voiceCommandsTemplate}")
 
     def getProfile(self):
-        return self.config.get()["Profile"]
+        return self.override or self.config.get()["Profile"]
 
     def getShortProfile(self):
-        return self.config.get()["Profile"].replace(".json", "")
+        return self.getProfile().replace(".json", "")
 
-    def setProfile(self, profile: str):
+    def setProfile(self, profile: str, persist: bool = True):
         if profile != "" and not profile in os.listdir(f"{self.workFolder}/profiles"):
             raise ValueError(f"Profile {profile} not present!")
 
+        if not persist:
+            self.override = profile
+            return None
+
         self.config.set("Profile", profile)
 
     def new(self, profile):
-        with open(f"{self.workFolder}/profiles/{profile}", "w") as fileW:
-            dump(self.defaultProfile, fileW, indent=4)
+        dumpAtomic(self.defaultProfile, f"{self.workFolder}/profiles/{profile}")
 
     def delete(self, profile):
-        os.remove(f"{self.workFolder}/profiles/{profile}")
+        with self.lock:
+            if not self.cache is None and self.cache[0] == profile:
+                if not self.flushTimer is None:
+                    self.flushTimer.cancel()
+                    self.flushTimer = None
+                self.cache = None
+                self.dirty = False
+
+            os.remove(f"{self.workFolder}/profiles/{profile}")
 
     def list(self):
         return tuple(folder for folder in sorted(os.listdir(f"{self.workFolder}/profiles")) if folder.endswith(".json"))
@@ -96,43 +180,108 @@ class Profile:
     def listShort(self):
         return tuple(folder.replace(".json", "", 1) for folder in sorted(os.listdir(f"{self.workFolder}/profiles")) if folder.endswith(".json"))
 
+    def _current(self):
+        profile = self.getProfile()
+        if self.cache is None or self.cache[0] != profile:
+            self.flush()
+            with open(f"{self.workFolder}/profiles/{profile}", "r") as fileR:
+                self.cache = (profile, load(fileR))
+
+        return self.cache[1]
+
+    def _scheduleFlush(self):
+        self.dirty = True
+
+        if not self.flushTimer is None:
+            self.flushTimer.cancel()
+
+        self.flushTimer = Timer(self.flushDelay, self.flush)
+        self.flushTimer.daemon = True
+        self.flushTimer.start()
+
+    def flush(self):
+        with self.lock:
+            if not self.flushTimer is None:
+                self.flushTimer.cancel()
+                self.flushTimer = None
+
+            if not self.dirty or self.cache is None:
+                return None
+
+            dumpAtomic(self.cache[1], f"{self.workFolder}/profiles/{self.cache[0]}")
+            self.dirty = False
+
+    def reload(self):
+        with self.lock:
+            self.flush()
+            self.cache = None
+
     def get(self):
-        with open(f"{self.workFolder}/profiles/{self.getProfile()}", "r") as fileR:
-            return load(fileR)
+        with self.lock:
+            currentProfile = self._current()
+            return {**currentProfile, "voiceCommands": [dict(record) for record in currentProfile["voiceCommands"]]}
 
     def set(self, key: str, value: any):
         if not type(value) is type(self.defaultProfile[key]):
             raise ValueError(f"Value type incorrect! {type(self.defaultProfile[key])} != {type(value)}")
 
-        currentProfile = self.get()
-        currentProfile[key] = value
-        with open(f"{self.workFolder}/profiles/{self.getProfile()}", "w") as fileW:
-            dump(currentProfile, fileW, indent=4)
+        with self.lock:
+            self._current()[key] = value
+            self._scheduleFlush()
 
     def addCommand(self, record: dict):
         self._voiceCommandsVerifyRecord(record)
 
-        currentProfile = self.get()
-        currentProfile["voiceCommands"].append(record)
-
-        with open(f"{self.workFolder}/profiles/{self.getProfile()}", "w") as fileW:
-            dump(currentProfile, fileW, indent=4)
+        with self.lock:
+            self._current()["voiceCommands"].append(dict(record))
+            self._scheduleFlush()
 
     def setCommand(self, index: int, record: dict):
         self._voiceCommandsVerifyRecord(record)
 
-        currentProfile = self.get()
-        currentProfile["voiceCommands"][index] = record
+        with self.lock:
+            self._current()["voiceCommands"][index] = dict(record)
+            self._scheduleFlush()
 
-        with open(f"{self.workFolder}/profiles/{self.getProfile()}", "w") as fileW:
-            dump(currentProfile, fileW, indent=4)
+    def addCommands(self, records: tuple):
+        for record in records:
+            self._voiceCommandsVerifyRecord(record)
+
+        with self.lock:
+            self._current()["voiceCommands"].extend(dict(record) for record in records)
+            self._scheduleFlush()
 
     def delCommand(self, index: int):
-        currentProfile = self.get()
-        currentProfile["voiceCommands"].pop(index)
+        with self.lock:
+            self._current()["voiceCommands"].pop(index)
+            self._scheduleFlush()
+
+    def delCommands(self, indexes: tuple):
+        with self.lock:
+            currentProfile = self._current()
+            for index in sorted(set(indexes), reverse=True):
+                currentProfile["voiceCommands"].pop(index)
+            self._scheduleFlush()
+
+
+class StartupReport:
+    def __init__(self):
+        self.start = perf_counter()
+        self.last = self.start
+        self.stages = []
+        self.reported = False
+
+    def mark(self, stage: str):
+        if self.reported:
+            return None
+
+        now = perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
 
-        with open(f"{self.workFolder}/profiles/{self.getProfile()}", "w") as fileW:
-            dump(currentProfile, fileW, indent=4)
+    def report(self):
+        self.reported = True
+        return f"Startup took {self.last - self.start:.2f}s; " + ", ".join(f"{stage} {duration:.2f}s" for stage, duration in self.stages)
 
 
 class Worker(QRunnable):
@@ -181,3 +330,12 @@ def ignoreStderr():
     finally:
         os.dup2(old_stderr, 2)
         os.close(old_stderr)
+
+
+startup = StartupReport()
+
+
+def dumpAtomic(data: dict, path: str, indent: int = 4):
+    with open(f"{path}.tmp", "w") as fileW:
+        dump(data, fileW, indent=indent)
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,93 @@
+import os
+import sys
+from collections import deque
+from logging import ERROR, INFO, WARNING, Formatter, StreamHandler, getLogger
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+
+logLevels = {"Red": ERROR, "Orange": WARNING}
+
+
+class LogBuffer:
+    def __init__(self, maxLines: int = 1000, path: str = None, maxBytes: int = 1048576, backupCount: int = 3):
+        self.lock = Lock()
+        self.pending = deque(maxlen=max(1, maxLines))
+
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+
+        self.logger = getLogger("VoiceCommander")
+        self.logger.setLevel(INFO)
+        self.logger.propagate = False
+        self.handler = None
+
+        self.configure(maxLines, path)
+
+    def configure(self, maxLines: int, path: str = None):
+        with self.lock:
+            self.maxLines = max(1, maxLines)
+            if self.pending.maxlen != self.maxLines:
+                self.pending = deque(self.pending, maxlen=self.maxLines)
+
+            if not self.handler is None and (path is None or self.handler.baseFilename != os.path.abspath(path)):
+                self.logger.removeHandler(self.handler)
+                self.handler.close()
+                self.handler = None
+
+            if not path is None and self.handler is None:
+                if not os.path.exists(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+
+                self.handler = RotatingFileHandler(path, maxBytes=self.maxBytes, backupCount=self.backupCount, encoding="utf-8")
+                self.handler.setFormatter(Formatter("%(asctime)s %(levelname)s %(message)s"))
+                self.logger.addHandler(self.handler)
+
+    def append(self, msg: str, color: str = "White"):
+        lines = str(msg).rstrip().splitlines() or [""]
+
+        with self.lock:
+            self.pending.append((lines[0], color))
+            self.pending.extend((line, "Transparent") for line in lines[1:])
+
+            if not self.handler is None:
+                self.logger.log(logLevels.get(color, INFO), "\n".join(lines))
+
+    def take(self):
+        with self.lock:
+            entries = tuple(self.pending)
+            self.pending.clear()
+
+            return entries
+
+    def close(self):
+        self.configure(self.maxLines, None)
+
+
+class LogEmitter:
+    def __init__(self, path: str = None, console: bool = True, maxBytes: int = 1048576, backupCount: int = 3):
+        self.logger = getLogger("VoiceCommander.daemon")
+        self.logger.setLevel(INFO)
+        self.logger.propagate = False
+
+        formatter = Formatter("%(asctime)s %(levelname)s %(message)s")
+
+        if console:
+            handler = StreamHandler(sys.stdout)
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+
+        if not path is None:
+            if not os.path.exists(os.path.dirname(os.path.abspath(path))):
+                os.makedirs(os.path.dirname(os.path.abspath(path)))
+
+            handler = RotatingFileHandler(path, maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8")
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+
+    def emit(self, msg: str, color: str = "White"):
+        self.logger.log(logLevels.get(color, INFO), str(msg).rstrip())
+
+    def close(self):
+        for handler in tuple(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
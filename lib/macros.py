@@ -0,0 +1,196 @@
+from string import printable
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter
+from traceback import format_exc
+
+from pynput.keyboard import Key
+
+from .metrics import markTrace
+from .pipeline import StageQueue
+
+modifierKeys = ("alt", "alt_gr", "alt_l", "alt_r", "cmd", "cmd_l", "cmd_r", "ctrl", "ctrl_l", "ctrl_r", "shift", "shift_l", "shift_r")
+
+
+def resolveKey(name: str):
+    if name in Key.__members__:
+        return Key[name]
+
+    if len(name) == 1 and name in printable:
+        return name
+
+    return None
+
+
+def compileMacro(macro: str, keyDelay: int = 100):
+    events = []
+    delay = keyDelay / 1000
+
+    for sequence in macro.split(";"):
+        if sequence.startswith("delay:") and sequence[6:].isdigit():
+            delay = int(sequence[6:]) / 1000
+            continue
+
+        if sequence in Key.__members__:
+            events.extend(((Key[sequence], True, 0), (Key[sequence], False, delay)))
+            continue
+
+        parts = sequence.split("+")
+        if len(parts) > 1 and any(part in modifierKeys for part in parts[:-1]) and all(not resolveKey(part) is None for part in parts):
+            keys = tuple(resolveKey(part) for part in parts)
+            events.extend((key, True, 0) for key in keys)
+            events.extend((key, False, 0) for key in reversed(keys))
+            events[-1] = (events[-1][0], False, delay)
+            continue
+
+        for char in tuple(sequence):
+            if char in printable:
+                events.extend(((char, True, 0), (char, False, delay)))
+
+    return tuple(events)
+
+
+def compileProfile(profile: dict):
+    return tuple({**record, "events": compileMacro(record["macro"], profile.get("keyDelay", 100))} for record in profile["voiceCommands"])
+
+
+class MacroExecutor:
+    allPolicies = ("sequential", "coalesce", "cancel")
+
+    def __init__(self, signals: object, keyboard: object, policy: str = "sequential", coalesceTime: int = 500, queueSize: int = 4, backpressure: str = "drop oldest", onTrace: object = lambda trace: None):
+        self.signals = signals
+        self.keyboard = keyboard
+        self.onTrace = onTrace
+
+        self.queue = StageQueue("macros", queueSize, backpressure, onDrop=self._dropped)
+        self.lock = Lock()
+        self.wake = Event()
+
+        self.generation = 0
+        self.lastEvents = None
+        self.lastSubmit = 0.0
+
+        self.metrics = {"executed": 0, "coalesced": 0, "cancelled": 0, "lastTime": 0.0, "maxTime": 0.0, "totalTime": 0.0}
+
+        self.stop = False
+        self.thread = None
+
+        self.configure(policy, coalesceTime, queueSize, backpressure)
+
+    def configure(self, policy: str, coalesceTime: int, queueSize: int, backpressure: str):
+        if not policy in self.allPolicies:
+            raise ValueError(f"Policy {policy} not in {self.allPolicies}!")
+
+        self.policy = policy
+        self.coalesceTime = coalesceTime / 1000
+        self.queue.configure(queueSize, backpressure)
+
+    def start(self):
+        self.thread = Thread(target=self._run, name="Macro", daemon=True)
+        self.thread.start()
+
+        return self
+
+    def close(self, drain: bool = False):
+        if drain:
+            self.queue.join()
+
+        self.stop = True
+        self.cancel()
+        self.queue.close()
+
+        if not self.thread is None:
+            self.thread.join(1)
+
+    def cancel(self):
+        with self.lock:
+            self.generation += 1
+            self.metrics["cancelled"] += self.queue.clear()
+            self.wake.set()
+
+    def submit(self, events: tuple, trace: dict = None):
+        with self.lock:
+            now = monotonic()
+            if self.policy == "coalesce" and events == self.lastEvents and now - self.lastSubmit < self.coalesceTime:
+                self.metrics["coalesced"] += 1
+                self.onTrace(trace)
+                return None
+
+            self.lastEvents, self.lastSubmit = events, now
+
+        if self.policy == "cancel":
+            self.cancel()
+
+        self.queue.put((self.generation, events, trace))
+
+    def stats(self):
+        with self.lock:
+            executed = self.metrics["executed"]
+            return {**self.metrics, "averageTime": self.metrics["totalTime"] / executed if executed > 0 else 0.0, **self.queue.stats()}
+
+    def _dropped(self, queue):
+        self.signals.log.emit(f"Macro queue is full, dropped a macro ({queue.counters['dropped']} total).", "Orange")
+
+    def _play(self, generation: int, events: tuple):
+        pressed = []
+        try:
+            for key, isPress, delay in events:
+                if generation != self.generation:
+                    return False
+
+                if isPress:
+                    self.keyboard.press(key)
+                    pressed.append(key)
+                else:
+                    self.keyboard.release(key)
+                    if key in pressed:
+                        pressed.remove(key)
+
+                if delay > 0:
+                    self.wake.wait(delay)
+
+            return True
+
+        finally:
+            for key in reversed(pressed):
+                self.keyboard.release(key)
+
+    def _run(self):
+        while not self.stop:
+            item = self.queue.get(0.1)
+            if item is None:
+                continue
+
+            try:
+                self._execute(*item)
+            finally:
+                self.queue.done()
+
+    def _execute(self, generation: int, events: tuple, trace: dict):
+        self.wake.clear()
+        if generation != self.generation:
+            with self.lock:
+                self.metrics["cancelled"] += 1
+            self.onTrace(trace)
+            return None
+
+        start = perf_counter()
+        markTrace(trace, "macro start")
+        try:
+            completed = self._play(generation, events)
+        except Exception:
+            print(format_exc())
+            self.signals.log.emit(format_exc(), "Red")
+            return None
+
+        duration = perf_counter() - start
+        if completed:
+            markTrace(trace, "macro end")
+        self.onTrace(trace)
+        with self.lock:
+            if completed:
+                self.metrics["executed"] += 1
+                self.metrics["lastTime"] = duration
+                self.metrics["maxTime"] = max(self.metrics["maxTime"], duration)
+                self.metrics["totalTime"] += duration
+            else:
+                self.metrics["cancelled"] += 1
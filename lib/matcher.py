@@ -0,0 +1,118 @@
+from functools import lru_cache
+from zlib import crc32
+
+import numpy
+
+
+@lru_cache(maxsize=65536)
+def phoneticKey(word: str):
+    for old, new in (("ph", "f"), ("gh", ""), ("ck", "k"), ("sch", "sk"), ("sh", "x"), ("ch", "x"), ("th", "0"), ("wh", "w"), ("wr", "r"), ("kn", "n"), ("c", "k"), ("q", "k"), ("x", "ks"), ("z", "s"), ("v", "f"), ("dg", "j")):
+        word = word.replace(old, new)
+
+    if word == "":
+        return word
+
+    key = word[0]
+    for char in word[1:]:
+        if char in "aeiouyhw" or char == key[-1]:
+            continue
+        key += char
+
+    return key
+
+
+class FuzzyMatcher:
+    def __init__(self, records: tuple, dimensions: int = 1024, phoneticWeight: float = 0.9):
+        self.dimensions = dimensions
+        self.phoneticWeight = phoneticWeight
+
+        commands = tuple(" ".join(record["command"].split()) for record in records)
+
+        self.valid = numpy.array(tuple(command != "" for command in commands), dtype=bool)
+        self.words = numpy.array(tuple(len(command.split()) for command in commands), dtype=numpy.int32)
+        self.partial = numpy.array(tuple(record["sensitivity"] >= 1 for record in records), dtype=bool)
+        self.thresholds = numpy.array(tuple(0.95 - 0.05 * record["sensitivity"] - 0.0001 for record in records), dtype=numpy.float32)
+        self.maxWords = int(self.words[self.partial].max()) if self.partial.any() else 0
+
+        self.textVectors = self.vectorize(commands).T.copy()
+        self.phoneticVectors = self.vectorize(tuple(" ".join(phoneticKey(word) for word in command.split()) for command in commands)).T.copy()
+
+    def vectorize(self, texts: tuple):
+        vectors = numpy.zeros((len(texts), self.dimensions), dtype=numpy.float32)
+        for i, text in enumerate(texts):
+            text = f" {text} "
+            for j in range(len(text) - 2):
+                vectors[i, crc32(text[j : j + 3].encode()) % self.dimensions] += 1
+
+        norms = numpy.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / numpy.where(norms == 0, 1, norms)
+
+    def match(self, phrase: str):
+        if not self.valid.any():
+            return None
+
+        words = phrase.split()
+        keys = tuple(phoneticKey(word) for word in words)
+
+        windows = [(0, len(words), True)]
+        for length in range(1, min(self.maxWords, len(words)) + 1):
+            windows.extend((i, length, False) for i in range(len(words) - length + 1))
+
+        text = self.vectorize(tuple(" ".join(words[i : i + length]) for i, length, _ in windows))
+        phonetic = self.vectorize(tuple(" ".join(keys[i : i + length]) for i, length, _ in windows))
+
+        textColumns = numpy.flatnonzero(text.any(axis=0))
+        phoneticColumns = numpy.flatnonzero(phonetic.any(axis=0))
+        scores = numpy.maximum(text[:, textColumns] @ self.textVectors[textColumns], self.phoneticWeight * (phonetic[:, phoneticColumns] @ self.phoneticVectors[phoneticColumns]))
+
+        full = numpy.array(tuple(isFull for _, _, isFull in windows), dtype=bool)[:, None]
+        lengths = numpy.array(tuple(length for _, length, _ in windows), dtype=numpy.int32)[:, None]
+        allowed = (full | ((lengths == self.words[None, :]) & self.partial[None, :])) & self.valid[None, :]
+
+        best = numpy.where(allowed, scores, -1).max(axis=0)
+        best = numpy.where(best >= self.thresholds, best + 0.001 * self.words, -1)
+
+        index = int(best.argmax())
+        return None if best[index] < 0 else index
+
+
+class CommandMatcher:
+    def __init__(self, voiceCommands: list | tuple, fuzzy: bool = False):
+        self.records = tuple(voiceCommands)
+        self.fuzzy = FuzzyMatcher(self.records) if fuzzy and len(self.records) > 0 else None
+
+        self.phrases = {}
+        self.ngrams = {}
+        self.maxWords = 0
+
+        for index, record in enumerate(self.records):
+            words = tuple(record["command"].split())
+            if len(words) == 0:
+                continue
+
+            self.phrases.setdefault(" ".join(words), index)
+
+            if record["sensitivity"] >= 1:
+                self.ngrams.setdefault(words, index)
+                self.maxWords = max(self.maxWords, len(words))
+
+    def match(self, phrase: str):
+        words = tuple(phrase.split())
+
+        index = self.phrases.get(" ".join(words))
+        if not index is None:
+            return index
+
+        for length in range(min(self.maxWords, len(words)), 0, -1):
+            indexes = tuple(self.ngrams[words[i : i + length]] for i in range(len(words) - length + 1) if words[i : i + length] in self.ngrams)
+            if len(indexes) > 0:
+                return min(indexes)
+
+        if not self.fuzzy is None:
+            return self.fuzzy.match(" ".join(words))
+
+        return None
+
+    def record(self, phrase: str):
+        index = self.match(phrase)
+        return None if index is None else self.records[index]
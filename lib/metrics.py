@@ -0,0 +1,117 @@
+from collections import deque
+from threading import Event, Lock, Thread
+from time import perf_counter, time
+from traceback import format_exc
+
+import numpy
+
+from .general import dumpAtomic
+
+allIntervals = (
+    ("endpointing", "speech start", "phrase end"),
+    ("queue", "phrase end", "recognize start"),
+    ("decoding", "recognize start", "recognize end"),
+    ("matching", "recognize end", "match"),
+    ("macro queue", "match", "macro start"),
+    ("macro", "macro start", "macro end"),
+    ("total", "phrase end", "macro end"),
+)
+
+bucketEdges = (0, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+
+def markTrace(trace: dict, stage: str):
+    if not trace is None:
+        trace[stage] = perf_counter()
+
+    return trace
+
+
+class LatencyHistogram:
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.buckets = numpy.zeros(len(bucketEdges) - 1, dtype=numpy.int64)
+        self.count = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.buckets[numpy.searchsorted(bucketEdges, seconds, side="right") - 1] += 1
+        self.count += 1
+
+    def summary(self):
+        if len(self.samples) == 0:
+            return {"count": self.count, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        p50, p95, p99 = numpy.percentile(numpy.fromiter(self.samples, dtype=numpy.float64), (50, 95, 99))
+        return {"count": self.count, "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(max(self.samples))}
+
+
+class Metrics:
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.lock = Lock()
+        self.histograms = {}
+        self.current = None
+
+        self.stop = Event()
+        self.thread = None
+
+    def record(self, trace: dict):
+        if trace is None:
+            return None
+
+        with self.lock:
+            histograms = self.histograms.setdefault(trace["recognizer"], {})
+            self.current = trace["recognizer"]
+
+            for interval, start, end in allIntervals:
+                if start in trace and end in trace and trace[end] >= trace[start]:
+                    histograms.setdefault(interval, LatencyHistogram(self.window)).add(trace[end] - trace[start])
+
+    def summary(self):
+        with self.lock:
+            return {recognizer: {interval: histogram.summary() for interval, histogram in histograms.items()} for recognizer, histograms in self.histograms.items()}
+
+    def statusText(self):
+        with self.lock:
+            if self.current is None:
+                return ""
+
+            histograms = self.histograms[self.current]
+            parts = []
+            for interval in ("endpointing", "decoding", "macro", "total"):
+                if interval in histograms:
+                    summary = histograms[interval].summary()
+                    parts.append(f"{interval} {summary['p50'] * 1000:.0f}/{summary['p95'] * 1000:.0f}/{summary['p99'] * 1000:.0f} ms")
+
+            return f"{self.current} p50/p95/p99: {', '.join(parts)}"
+
+    def dump(self, path: str):
+        with self.lock:
+            histograms = {recognizer: {interval: {**histogram.summary(), "buckets": dict(zip((f"<{edge}" for edge in bucketEdges[1:]), histogram.buckets.tolist()))} for interval, histogram in intervals.items()} for recognizer, intervals in self.histograms.items()}
+
+        dumpAtomic({"time": time(), "recognizers": histograms}, path)
+
+    def dumpEvery(self, path: str, interval: float):
+        self.close()
+
+        if interval <= 0:
+            return None
+
+        self.stop = Event()
+        self.thread = Thread(target=self._dumpLoop, args=(path, interval, self.stop), name="Metrics", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.stop.set()
+
+        if not self.thread is None:
+            self.thread.join(1)
+            self.thread = None
+
+    def _dumpLoop(self, path: str, interval: float, stop: Event):
+        while not stop.wait(interval):
+            try:
+                self.dump(path)
+            except OSError:
+                print(format_exc())
@@ -0,0 +1,234 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import Future
+from gc import collect
+from hashlib import sha256
+from json import dump, load
+from shutil import move, rmtree, unpack_archive
+from threading import Lock
+from time import sleep
+from zipfile import BadZipFile, ZipFile
+
+voskModels = {}
+voskModelsLock = Lock()
+
+whisperModels = OrderedDict()
+whisperModelsLock = Lock()
+whisperLoads = {}
+whisperUsers = {}
+
+
+class ModelStore:
+    def __init__(self, folder: str):
+        self.folder = folder
+
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+
+    def path(self, name: str):
+        return f"{self.folder}/{name}"
+
+    def manifestPath(self, name: str):
+        return f"{self.folder}/{name}.manifest.json"
+
+    def _listFiles(self, name: str):
+        files = {}
+        for root, _, fileNames in os.walk(self.path(name)):
+            for fileName in fileNames:
+                filePath = os.path.join(root, fileName)
+                files[os.path.relpath(filePath, self.path(name)).replace("\\", "/")] = os.path.getsize(filePath)
+
+        return files
+
+    def isValid(self, name: str, archive: str):
+        if not os.path.exists(self.manifestPath(name)) or not os.path.isdir(self.path(name)):
+            return False
+
+        try:
+            with open(self.manifestPath(name), "r") as fileR:
+                manifest = load(fileR)
+        except ValueError:
+            return False
+
+        if manifest.get("name") != name:
+            return False
+
+        if os.path.exists(archive) and manifest.get("archiveSize") != os.path.getsize(archive):
+            return False
+
+        for filePath, size in manifest.get("files", {}).items():
+            if not os.path.isfile(f"{self.path(name)}/{filePath}") or os.path.getsize(f"{self.path(name)}/{filePath}") != size:
+                return False
+
+        return len(manifest.get("files", {})) > 0
+
+    def extract(self, name: str, archive: str):
+        tmpFolder = f"{self.folder}/.extracting-{name}"
+        if os.path.exists(tmpFolder):
+            rmtree(tmpFolder)
+
+        unpack_archive(archive, tmpFolder)
+
+        if os.path.exists(self.manifestPath(name)):
+            os.remove(self.manifestPath(name))
+        if os.path.exists(self.path(name)):
+            rmtree(self.path(name))
+
+        move(f"{tmpFolder}/{name}" if os.path.isdir(f"{tmpFolder}/{name}") else tmpFolder, self.path(name))
+
+        if os.path.exists(tmpFolder):
+            rmtree(tmpFolder)
+
+        with open(f"{self.manifestPath(name)}.tmp", "w") as fileW:
+            dump({"name": name, "archive": os.path.basename(archive), "archiveSize": os.path.getsize(archive), "files": self._listFiles(name)}, fileW, indent=4)
+        os.replace(f"{self.manifestPath(name)}.tmp", self.manifestPath(name))
+
+
+def download(url: str, path: str, signals: object, checksum: str = None, attempts: int = 3, chunkSize: int = 1048576):
+    from requests import RequestException, get
+
+    partPath = f"{path}.part"
+    name = os.path.basename(path)
+
+    for attempt in range(1, attempts + 1):
+        try:
+            offset = os.path.getsize(partPath) if os.path.exists(partPath) else 0
+
+            with get(url, headers={"Range": f"bytes={offset}-"} if offset > 0 else {}, stream=True, timeout=30) as req:
+                if req.status_code == 416:
+                    total = int(req.headers.get("Content-Range", "*/0").split("/")[-1] or 0)
+                    if total == 0 or offset != total:
+                        os.remove(partPath)
+                        raise OSError(f"Resume of {name} rejected by server, restarting download.")
+
+                elif req.status_code in (200, 206):
+                    if req.status_code == 200:
+                        offset = 0
+                        total = int(req.headers.get("Content-Length", 0))
+                    else:
+                        total = int(req.headers["Content-Range"].split("/")[-1])
+
+                    if offset > 0:
+                        signals.log.emit(f"Resuming download of {name} at {offset // 1048576} MB.", "Yellow")
+
+                    written, reported = offset, -1
+                    with open(partPath, "ab" if offset > 0 else "wb") as fileW:
+                        for chunk in req.iter_content(chunkSize):
+                            fileW.write(chunk)
+                            written += len(chunk)
+
+                            if total > 0 and written * 10 // total > reported:
+                                reported = written * 10 // total
+                                signals.log.emit(f"Downloading {name}: {reported * 10}% ({written // 1048576}/{total // 1048576} MB).", "Yellow")
+
+                else:
+                    raise OSError(f"Download of {name} failed with status {req.status_code}!")
+
+            if total > 0 and os.path.getsize(partPath) != total:
+                raise OSError(f"Download of {name} incomplete! {os.path.getsize(partPath)} != {total} bytes")
+
+            verify(partPath, checksum)
+
+            os.replace(partPath, path)
+            return path
+
+        except (RequestException, OSError) as err:
+            signals.log.emit(f"Download attempt {attempt} of {name} failed; {err}", "Orange")
+
+        except ValueError as err:
+            if os.path.exists(partPath):
+                os.remove(partPath)
+            signals.log.emit(f"Download attempt {attempt} of {name} failed; {err}", "Orange")
+
+        sleep(attempt)
+
+    raise OSError(f"Failed to download {name} from {url}!")
+
+
+def verify(path: str, checksum: str = None):
+    if not checksum is None:
+        digest = sha256()
+        with open(path, "rb") as fileR:
+            for chunk in iter(lambda: fileR.read(1048576), b""):
+                digest.update(chunk)
+
+        if digest.hexdigest() != checksum.lower():
+            raise ValueError(f"Checksum mismatch! {digest.hexdigest()} != {checksum.lower()}")
+
+    if path.endswith(".zip") or path.endswith(".zip.part"):
+        try:
+            with ZipFile(path) as zipFile:
+                corrupt = zipFile.testzip()
+        except BadZipFile as err:
+            raise ValueError(f"Archive corrupt! {err}")
+
+        if not corrupt is None:
+            raise ValueError(f"Archive corrupt! Bad CRC for {corrupt}")
+
+
+def loadVoskModel(path: str):
+    from vosk import Model
+
+    with voskModelsLock:
+        if not path in voskModels:
+            voskModels[path] = Model(path)
+
+        return voskModels[path]
+
+
+def loadWhisperModel(name: str, memoryBudget: int = 0):
+    import whisper
+
+    with whisperModelsLock:
+        whisperUsers[name] = whisperUsers.get(name, 0) + 1
+
+        if name in whisperModels:
+            whisperModels.move_to_end(name)
+            return whisperModels[name][0]
+
+        loading = whisperLoads.get(name)
+        if loading is None:
+            whisperLoads[name] = Future()
+
+    try:
+        if not loading is None:
+            return loading.result()
+
+        model = whisper.load_model(name)
+    except BaseException as err:
+        releaseWhisperModel(name)
+        if loading is None:
+            with whisperModelsLock:
+                whisperLoads.pop(name).set_exception(err)
+        raise
+
+    with whisperModelsLock:
+        whisperModels[name] = (model, sum(tensor.numel() * tensor.element_size() for tensor in (*model.parameters(), *model.buffers())))
+        whisperLoads.pop(name).set_result(model)
+
+        evicted = evictWhisperModels(memoryBudget)
+
+    if evicted:
+        collect()
+
+    return model
+
+
+def releaseWhisperModel(name: str, memoryBudget: int = 0):
+    with whisperModelsLock:
+        whisperUsers[name] = max(0, whisperUsers.get(name, 0) - 1)
+        evicted = evictWhisperModels(memoryBudget)
+
+    if evicted:
+        collect()
+
+
+def evictWhisperModels(memoryBudget: int):
+    unused = [name for name in whisperModels if whisperUsers.get(name, 0) == 0]
+    evicted = False
+
+    while memoryBudget > 0 and len(unused) > 0 and sum(size for _, size in whisperModels.values()) > memoryBudget * 1048576:
+        whisperModels.pop(unused.pop(0))
+        evicted = True
+
+    return evicted
@@ -0,0 +1,212 @@
+from collections import deque
+from threading import Condition, Lock, Thread
+from traceback import format_exc
+
+from .metrics import markTrace
+
+
+class StageQueue:
+    allPolicies = ("drop oldest", "block")
+
+    def __init__(self, name: str, maxSize: int = 4, policy: str = "drop oldest", onDrop: object = lambda queue: None):
+        self.name = name
+        self.onDrop = onDrop
+
+        self.items = deque()
+        self.condition = Condition()
+        self.closed = False
+        self.active = 0
+
+        self.counters = {"put": 0, "processed": 0, "dropped": 0, "peak": 0}
+
+        self.configure(maxSize, policy)
+
+    def configure(self, maxSize: int, policy: str):
+        if not policy in self.allPolicies:
+            raise ValueError(f"Policy {policy} not in {self.allPolicies}!")
+
+        with self.condition:
+            self.maxSize = max(1, maxSize)
+            self.policy = policy
+            self.condition.notify_all()
+
+    def put(self, item, timeout: float = None):
+        with self.condition:
+            if self.policy == "block":
+                self.condition.wait_for(lambda: len(self.items) < self.maxSize or self.closed, timeout)
+
+            dropped = False
+            if self.closed or (self.policy == "block" and len(self.items) >= self.maxSize):
+                self.counters["dropped"] += 1
+                dropped = True
+            else:
+                while len(self.items) >= self.maxSize:
+                    self.items.popleft()
+                    self.counters["dropped"] += 1
+                    dropped = True
+
+                self.items.append(item)
+                self.counters["put"] += 1
+                self.counters["peak"] = max(self.counters["peak"], len(self.items))
+                self.condition.notify_all()
+
+        if dropped:
+            self.onDrop(self)
+
+        return not self.closed
+
+    def get(self, timeout: float = None):
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.items) > 0 or self.closed, timeout)
+            if len(self.items) == 0:
+                return None
+
+            item = self.items.popleft()
+            self.counters["processed"] += 1
+            self.active += 1
+            self.condition.notify_all()
+
+            return item
+
+    def done(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def join(self, timeout: float = None):
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.items) == 0 and self.active == 0, timeout)
+
+    def clear(self):
+        with self.condition:
+            cleared = len(self.items)
+            self.items.clear()
+            self.condition.notify_all()
+
+            return cleared
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def depth(self):
+        return len(self.items)
+
+    def stats(self):
+        with self.condition:
+            return {**self.counters, "depth": len(self.items)}
+
+
+class Deduplicator:
+    def __init__(self, window: int = 1000):
+        self.window = window / 1000
+        self.lock = Lock()
+        self.recent = deque(maxlen=256)
+        self.counters = {"duplicates": 0}
+
+    def configure(self, window: int):
+        self.window = window / 1000
+
+    def isDuplicate(self, key: object, device: str, at: float):
+        with self.lock:
+            while len(self.recent) > 0 and self.recent[0][2] < at - self.window * 2:
+                self.recent.popleft()
+
+            if any(k == key and d != device and abs(t - at) < self.window for k, d, t in self.recent):
+                self.counters["duplicates"] += 1
+                return True
+
+            self.recent.append((key, device, at))
+            return False
+
+
+class Pipeline:
+    def __init__(self, signals: object, recognize: object, match: object, execute: object, queueSize: int = 4, policy: str = "drop oldest", workers: int = 1, onTrace: object = lambda trace: None, dedupWindow: int = 1000):
+        self.signals = signals
+        self.onTrace = onTrace
+        self.deduplicator = Deduplicator(dedupWindow)
+
+        self.recognize = recognize
+        self.match = match
+        self.execute = execute
+
+        self.workers = max(1, workers)
+
+        self.phrases = StageQueue("phrases", queueSize, policy, onDrop=self._dropped)
+
+        self.stop = False
+        self.threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            self.threads.append(Thread(target=self._recognizeWorker, name=f"Recognizer {i}", daemon=True))
+
+        for thread in self.threads:
+            thread.start()
+
+        return self
+
+    def close(self, drain: bool = False):
+        if drain:
+            self.phrases.join()
+
+        self.stop = True
+
+        self.phrases.close()
+
+        for thread in self.threads:
+            thread.join(1)
+
+    def configure(self, queueSize: int, policy: str, dedupWindow: int = 1000):
+        self.phrases.configure(queueSize, policy)
+        self.deduplicator.configure(dedupWindow)
+
+    def stats(self):
+        return {self.phrases.name: self.phrases.stats(), **self.deduplicator.counters}
+
+    def submit(self, audio, trace: dict = None):
+        return self.phrases.put((audio, trace))
+
+    def dispatch(self, command: str, trace: dict = None):
+        macro = self.match(command)
+        markTrace(trace, "match")
+
+        if macro is None:
+            self.onTrace(trace)
+            return None
+
+        if not trace is None and "device" in trace and self.deduplicator.isDuplicate(macro, trace["device"], trace["speech start"]):
+            self.signals.log.emit(f"Ignored duplicate command from {trace['device']}.", "White")
+            self.onTrace(trace)
+            return None
+
+        self.execute(macro, trace)
+
+    def _dropped(self, queue):
+        self.signals.log.emit(f"Pipeline {queue.name} queue is full, dropped an item ({queue.counters['dropped']} total).", "Orange")
+
+    def _recognizeWorker(self):
+        while not self.stop:
+            item = self.phrases.get(0.1)
+            if item is None:
+                continue
+
+            audio, trace = item
+            try:
+                markTrace(trace, "recognize start")
+                command = self.recognize(audio)
+                markTrace(trace, "recognize end")
+
+                if command is None or command == "":
+                    self.onTrace(trace)
+                    continue
+
+                self.dispatch(command, trace)
+
+            except Exception:
+                print(format_exc())
+                self.signals.log.emit(format_exc(), "Red")
+
+            finally:
+                self.phrases.done()
@@ -0,0 +1,145 @@
+from importlib import import_module
+
+if False:
+    import numpy
+    import pocketsphinx
+    import PyAudio
+    import soundfile
+    import torch
+    import vosk
+    import whisper  # openai-whisper
+
+# https://alphacephei.com/vosk/models
+
+voskAllModels = {
+    "small-en": ("vosk-model-small-en-us-0.15", "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"),
+    "en-us": ("vosk-model-en-us-0.22", "https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip"),
+    "small-nl": ("vosk-model-small-nl-0.22", "https://alphacephei.com/vosk/models/vosk-model-small-nl-0.22.zip"),
+    "nl-spraakherkenning": ("vosk-model-nl-spraakherkenning-0.6", "https://alphacephei.com/vosk/models/vosk-model-nl-spraakherkenning-0.6.zip"),
+}
+
+# https://github.com/openai/whisper/blob/main/whisper/tokenizer.py
+
+whisperAllLanguages = (
+    "",
+    "english",
+    "chinese",
+    "german",
+    "spanish",
+    "russian",
+    "korean",
+    "french",
+    "japanese",
+    "portuguese",
+    "turkish",
+    "polish",
+    "catalan",
+    "dutch",
+    "arabic",
+    "swedish",
+    "italian",
+    "indonesian",
+    "hindi",
+    "finnish",
+    "vietnamese",
+    "hebrew",
+    "ukrainian",
+    "greek",
+    "malay",
+    "czech",
+    "romanian",
+    "danish",
+    "hungarian",
+    "tamil",
+    "norwegian",
+    "thai",
+    "urdu",
+    "croatian",
+    "bulgarian",
+    "lithuanian",
+    "latin",
+    "maori",
+    "malayalam",
+    "welsh",
+    "slovak",
+    "telugu",
+    "persian",
+    "latvian",
+    "bengali",
+    "serbian",
+    "azerbaijani",
+    "slovenian",
+    "kannada",
+    "estonian",
+    "macedonian",
+    "breton",
+    "basque",
+    "icelandic",
+    "armenian",
+    "nepali",
+    "mongolian",
+    "bosnian",
+    "kazakh",
+    "albanian",
+    "swahili",
+    "galician",
+    "marathi",
+    "punjabi",
+    "sinhala",
+    "khmer",
+    "shona",
+    "yoruba",
+    "somali",
+    "afrikaans",
+    "occitan",
+    "georgian",
+    "belarusian",
+    "tajik",
+    "sindhi",
+    "gujarati",
+    "amharic",
+    "yiddish",
+    "lao",
+    "uzbek",
+    "faroese",
+    "haitian creole",
+    "pashto",
+    "turkmen",
+    "nynorsk",
+    "maltese",
+    "sanskrit",
+    "luxembourgish",
+    "myanmar",
+    "tibetan",
+    "tagalog",
+    "malagasy",
+    "assamese",
+    "tatar",
+    "hawaiian",
+    "lingala",
+    "hausa",
+    "bashkir",
+    "javanese",
+    "sundanese",
+    "cantonese",
+)
+
+# https://github.com/openai/whisper/blob/main/whisper/__init__.py
+
+whisperAllModels = ("tiny", "base", "small", "medium", "large", "large-v1", "large-v2", "large-v3")
+
+allRecognizers = {
+    "vosk": {"module": "vosk", "class": "vosk", "options": ("Model",), "models": tuple(voskAllModels)},
+    "vosk-stream": {"module": "vosk", "class": "voskStream", "options": ("Model",), "models": tuple(voskAllModels)},
+    "whisper": {"module": "whisper", "class": "whisper", "options": ("Language", "Model"), "languages": whisperAllLanguages, "models": whisperAllModels},
+    "sphinx": {"module": "sphinx", "class": "sphinx", "options": ()},
+    "sphinx-stream": {"module": "sphinx", "class": "sphinxStream", "options": ()},
+    "cascade": {"module": "cascade", "class": "cascade", "options": ()},
+}
+
+
+def loadRecognizer(name: str):
+    if not name in allRecognizers:
+        raise ValueError(f"Recognizer {name} not in {tuple(allRecognizers)}!")
+
+    return getattr(import_module(f".{allRecognizers[name]['module']}", __name__), allRecognizers[name]["class"])
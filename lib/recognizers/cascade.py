@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+from traceback import format_exc
+
+from ..matcher import CommandMatcher
+from . import allRecognizers, loadRecognizer
+
+
+class cascade:
+    allTiers = ("fast", "slow")
+
+    def __init__(self, signals: object, config: dict, profile: dict, *args, **kwargs):
+        self.signals = signals
+
+        self.fuzzy = config["Fuzzy matching"]
+        self.minConfidence = config["cascade:Min confidence"]
+        self.timeouts = {"fast": config["cascade:Fast timeout"] / 1000, "slow": config["cascade:Slow timeout"] / 1000}
+        self.names = {"fast": config["cascade:Fast"], "slow": config["cascade:Slow"]}
+
+        self.tiers = {}
+        for tier, name in self.names.items():
+            if name == "cascade" or not name in allRecognizers:
+                raise ValueError(f"Cascade {tier} recognizer {name} not in {tuple(recognizer for recognizer in allRecognizers if recognizer != 'cascade')}!")
+
+            self.tiers[tier] = loadRecognizer(name)(signals=signals, config=config, profile=profile)
+            if getattr(self.tiers[tier], "streaming", False):
+                raise ValueError(f"Cascade {tier} recognizer {name} is a streaming recognizer!")
+
+        self.executors = {tier: ThreadPoolExecutor(config["Recognizer workers"] + 1, thread_name_prefix=f"Cascade {tier}") for tier in self.allTiers}
+        self.abandoned = {tier: set() for tier in self.allTiers}
+
+        self.lock = Lock()
+        self.counters = {"fast": 0, "slow": 0, "none": 0, "fast timeouts": 0, "slow timeouts": 0}
+
+        self.matcher = None
+        self.updateProfile(profile)
+
+        self.signals.log.emit(f"Cascade will only pass phrases to {self.names['slow']} when {self.names['fast']} finds no command or is not confident enough.", "White")
+
+    def warmUp(self):
+        for recognizer in self.tiers.values():
+            if hasattr(recognizer, "warmUp"):
+                recognizer.warmUp()
+
+    def updateProfile(self, profile: dict):
+        self.matcher = CommandMatcher(profile["voiceCommands"], fuzzy=self.fuzzy)
+
+        for recognizer in self.tiers.values():
+            if hasattr(recognizer, "updateProfile"):
+                recognizer.updateProfile(profile)
+
+    def recognize(self, tier: str, audio):
+        with self.lock:
+            self.abandoned[tier] = {future for future in self.abandoned[tier] if not future.done()}
+            busy = len(self.abandoned[tier]) > 0
+
+        if busy:
+            self.count(f"{tier} timeouts")
+            self.signals.log.emit(f"Cascade {self.names[tier]} is still busy with a timed out phrase, skipped.", "Orange")
+            return None, 0.0
+
+        recognizer = self.tiers[tier]
+        future = self.executors[tier].submit(recognizer.runConfidence if hasattr(recognizer, "runConfidence") else lambda audio: (recognizer.run(audio), 1.0), audio)
+
+        try:
+            return future.result(self.timeouts[tier] if self.timeouts[tier] > 0 else None)
+        except FutureTimeoutError:
+            with self.lock:
+                self.abandoned[tier].add(future)
+            self.count(f"{tier} timeouts")
+            self.signals.log.emit(f"Cascade {self.names[tier]} timed out after {self.timeouts[tier]:.1f}s.", "Orange")
+        except Exception:
+            print(format_exc())
+            self.signals.log.emit(f"Cascade {self.names[tier]} failed to recognize audio!", "Red")
+
+        return None, 0.0
+
+    def count(self, counter: str):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def run(self, audio):
+        fast, confidence = self.recognize("fast", audio)
+        if not fast is None and fast != "" and confidence >= self.minConfidence and not self.matcher.record(fast) is None:
+            self.count("fast")
+            return fast
+
+        slow, _ = self.recognize("slow", audio)
+        if not slow is None and slow != "" and not self.matcher.record(slow) is None:
+            self.count("slow")
+            return slow
+
+        self.count("none")
+        return slow or fast
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+
+        decided = sum(counters[tier] for tier in (*self.allTiers, "none"))
+        return {"tiers": self.names, **counters, "fast rate": counters["fast"] / decided if decided > 0 else 0.0}
+
+    def statusText(self):
+        stats = self.stats()
+        return f"{self.names['fast']} {stats['fast']}, {self.names['slow']} {stats['slow']}, no match {stats['none']}" + (f", {stats['fast timeouts'] + stats['slow timeouts']} timeouts" if stats["fast timeouts"] + stats["slow timeouts"] > 0 else "")
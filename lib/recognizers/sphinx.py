@@ -0,0 +1,118 @@
+import os
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+import numpy
+import speech_recognition
+
+from ..audio import toFloat32
+
+
+class sphinx:
+    def __init__(self, signals: object, profile: dict, *args, **kwargs):
+        from pocketsphinx import Config, Decoder
+
+        self.signals = signals
+        self.lock = Lock()
+
+        dataFolder = f"{os.path.dirname(speech_recognition.__file__)}/pocketsphinx-data/en-US"
+        config = Config()
+        config.set_string("-hmm", f"{dataFolder}/acoustic-model")
+        config.set_string("-lm", f"{dataFolder}/language-model.lm.bin")
+        config.set_string("-dict", f"{dataFolder}/pronounciation-dictionary.dict")
+        config.set_string("-logfn", os.devnull)
+        self.decoder = Decoder(config)
+
+        self.searching = False
+        self.inUtterance = False
+        self.pendingKeywords = None
+        self.updateProfile(profile)
+        self.applyKeywords()
+
+        self.signals.log.emit("Sphinx will only recognize phrases that are defined in the profile.", "White")
+
+    def updateProfile(self, profile: dict):
+        self.pendingKeywords = tuple(sorted({(vc["command"], vc["sensitivity"] / 10) for vc in profile["voiceCommands"] if vc["command"] != ""}))
+
+    def applyKeywords(self):
+        keywords, self.pendingKeywords = self.pendingKeywords, None
+        if keywords is None:
+            return None
+
+        if self.inUtterance:
+            self.decoder.end_utt()
+            self.inUtterance = False
+
+        self.searching = len(keywords) > 0
+        if not self.searching:
+            self.signals.log.emit("Sphinx has no voice commands to listen for.", "Orange")
+            return None
+
+        with NamedTemporaryFile("w", suffix=".kws", delete=False) as fileW:
+            fileW.writelines(f"{keyword} /1e{100 * min(max(sensitivity, 0), 1) - 110:.0f}/\n" for keyword, sensitivity in keywords)
+
+        try:
+            self.decoder.add_kws("keywords", fileW.name)
+            self.decoder.activate_search("keywords")
+        finally:
+            os.remove(fileW.name)
+
+    def toRaw(self, frameData: bytes, sampleRate: int, sampleWidth: int = 2):
+        if sampleRate == 16000 and sampleWidth == 2:
+            return frameData
+
+        return (toFloat32(frameData, sampleRate, sampleWidth) * 32767).astype(numpy.int16).tobytes()
+
+    def clean(self, hypothesis: object):
+        if hypothesis is None:
+            return ""
+
+        out = "".join(char for char in tuple(hypothesis.hypstr.lower()) if char.isalnum() or char.isspace()).strip()
+        if out != "":
+            self.signals.log.emit(out, "Green")
+        return out
+
+    def run(self, audio):
+        with self.lock:
+            self.applyKeywords()
+            if not self.searching:
+                return None
+
+            self.decoder.start_utt()
+            self.decoder.process_raw(self.toRaw(audio.frame_data, audio.sample_rate, audio.sample_width), False, True)
+            self.decoder.end_utt()
+
+            out = self.clean(self.decoder.hyp())
+            if out == "":
+                self.signals.log.emit("Sphinx failed to reconize audio!", "Orange")
+                return None
+            return out
+
+
+class sphinxStream(sphinx):
+    streaming = True
+
+    def __init__(self, signals: object, profile: dict, *args, **kwargs):
+        super().__init__(signals, profile)
+
+        self.signals.log.emit("Sphinx stream will trigger macros as soon as a command is spotted, without waiting for the phrase to end.", "White")
+
+    def feed(self, chunk: bytes, sampleRate: int):
+        with self.lock:
+            self.applyKeywords()
+            if not self.searching:
+                return None
+
+            if not self.inUtterance:
+                self.decoder.start_utt()
+                self.inUtterance = True
+
+            self.decoder.process_raw(self.toRaw(chunk, sampleRate), False, False)
+            hypothesis = self.decoder.hyp()
+            if hypothesis is None:
+                return None
+
+            self.decoder.end_utt()
+            self.inUtterance = False
+
+            return self.clean(hypothesis)
@@ -0,0 +1,124 @@
+import os
+from json import loads
+
+from speech_recognition import AudioData
+
+from ..models import ModelStore, download, loadVoskModel
+from . import voskAllModels
+
+
+class vosk:
+    allModels = voskAllModels
+
+    name = "vosk"
+
+    def __init__(self, signals: object, config: dict, *args, **kwargs):
+        self.signals = signals
+
+        self.workfolder = os.path.split(__file__)[0].replace("\\", "/").replace("/lib/recognizers", "")
+
+        self.model = config[f"{self.name}:Model"]
+        self.kaldiModel = None
+
+        self.getModel(self.model)
+
+    def getModel(self, model):
+        store = ModelStore(f"{self.workfolder}/models")
+        name = self.allModels[model][0]
+        archive = f"{store.folder}/{name}.zip"
+
+        if not store.isValid(name, archive):
+            if not os.path.exists(archive):
+                self.signals.log.emit(f"Downloading vosk model {name}.", "Yellow")
+                download(self.allModels[model][1], archive, self.signals, checksum=self.allModels[model][2] if len(self.allModels[model]) > 2 else None)
+
+            self.signals.log.emit(f"Preparing vosk model {name}.", "Yellow")
+
+            store.extract(name, archive)
+
+        self.kaldiModel = loadVoskModel(store.path(name))
+
+    def warmUp(self):
+        self.run(AudioData(bytes(16000), 16000, 2))
+
+    def run(self, audio):
+        return self.runConfidence(audio)[0]
+
+    def runConfidence(self, audio):
+        from vosk import KaldiRecognizer
+
+        kaldi = KaldiRecognizer(self.kaldiModel, audio.sample_rate)
+        kaldi.SetWords(True)
+        kaldi.AcceptWaveform(audio.get_raw_data(convert_width=2))
+
+        result = loads(kaldi.FinalResult())
+        words = result.get("result", [])
+
+        out = "".join(char for char in tuple(result["text"].lower()) if char.isalnum() or char.isspace()).strip()
+        if out != "":
+            self.signals.log.emit(out, "Green")
+        return out, sum(word["conf"] for word in words) / len(words) if len(words) > 0 else 0.0
+
+
+class voskStream(vosk):
+    name = "vosk-stream"
+    streaming = True
+
+    def __init__(self, signals: object, config: dict, profile: dict, *args, **kwargs):
+        super().__init__(signals, config)
+
+        self.updateProfile(profile)
+
+        self.kaldi = None
+        self.sampleRate = None
+        self.fired = None
+
+        self.signals.log.emit("Vosk stream will trigger macros as soon as a command is recognized.", "White")
+
+    def updateProfile(self, profile: dict):
+        self.vcs = tuple((vc["command"], vc["sensitivity"]) for vc in profile["voiceCommands"] if vc["command"] != "")
+
+    def matchPartial(self, partial: str):
+        words = f" {partial} "
+        candidates = tuple(com for com, sensitivity in self.vcs if partial == com or (sensitivity >= 1 and f" {com} " in words))
+        if len(candidates) != 1:
+            return None
+
+        if any(com != candidates[0] and com.startswith(f"{partial} ") for com, sensitivity in self.vcs):
+            return None
+
+        return candidates[0]
+
+    def feed(self, chunk: bytes, sampleRate: int):
+        from vosk import KaldiRecognizer
+
+        if self.kaldi is None or self.sampleRate != sampleRate:
+            self.kaldi = KaldiRecognizer(self.kaldiModel, sampleRate)
+            self.sampleRate = sampleRate
+            self.fired = None
+
+        if self.kaldi.AcceptWaveform(chunk):
+            out = "".join(char for char in tuple(loads(self.kaldi.Result())["text"].lower()) if char.isalnum() or char.isspace()).strip()
+
+            fired, self.fired = self.fired, None
+            if not fired is None:
+                out = f" {out} ".replace(f" {fired} ", " ", 1).strip()
+
+            if out != "":
+                self.signals.log.emit(out, "Green")
+            return out
+
+        if not self.fired is None:
+            return None
+
+        partial = "".join(char for char in tuple(loads(self.kaldi.PartialResult())["partial"].lower()) if char.isalnum() or char.isspace()).strip()
+        if partial == "":
+            return None
+
+        command = self.matchPartial(partial)
+        if command is None:
+            return None
+
+        self.fired = command
+        self.signals.log.emit(partial, "Green")
+        return command
@@ -0,0 +1,49 @@
+from threading import Lock
+from weakref import finalize
+
+import numpy
+
+from ..audio import toFloat32
+from ..models import loadWhisperModel, releaseWhisperModel
+from . import whisperAllLanguages, whisperAllModels
+
+
+class whisper:
+    allLanguages = whisperAllLanguages
+    allModels = whisperAllModels
+
+    decodeOptions = {"without_timestamps": True, "condition_on_previous_text": False, "temperature": 0.0, "fp16": False}
+
+    def __init__(self, signals: object, config: dict, decodeOptions: dict = {}, *args, **kwargs):
+        self.signals = signals
+
+        self.language = config["whisper:Language"]
+        self.model = config["whisper:Model"]
+        self.memoryBudget = config["whisper:Memory"]
+
+        self.modelName = f'{self.model}{".en" if self.language == "english" and self.model in ("tiny", "base", "small", "medium") else ""}'
+        self.decodeOptions = {**self.decodeOptions, "language": None if self.language == "" else self.language, "beam_size": config["whisper:Beam size"] or None, **decodeOptions}
+
+        self.whisperModel = None
+        self.lock = Lock()
+
+    def getModel(self):
+        with self.lock:
+            if self.whisperModel is None:
+                self.whisperModel = loadWhisperModel(self.modelName, self.memoryBudget)
+                finalize(self, releaseWhisperModel, self.modelName, self.memoryBudget)
+
+            return self.whisperModel
+
+    def warmUp(self):
+        self.signals.log.emit(f"Loading whisper model {self.modelName}, this might take some time the first time.", "White")
+
+        self.getModel().transcribe(numpy.zeros(16000, dtype=numpy.float32), **self.decodeOptions)
+        self.signals.log.emit(f"Loaded whisper model {self.modelName}.", "Green")
+
+    def run(self, audio):
+        out = self.getModel().transcribe(toFloat32(audio.frame_data, audio.sample_rate, audio.sample_width), **self.decodeOptions)["text"]
+        out = "".join(char for char in tuple(out.lower()) if char.isalnum() or char.isspace()).strip()
+        if out != "":
+            self.signals.log.emit(out, "Green")
+        return out
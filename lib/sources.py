@@ -0,0 +1,182 @@
+import os
+import socket
+import sys
+from time import perf_counter, sleep
+
+import numpy
+from speech_recognition import AudioFile, AudioSource, Microphone
+
+allSources = ("microphone", "file", "stdin", "socket")
+
+
+def toInt16(frameData: bytes, sampleWidth: int):
+    if sampleWidth == 2:
+        return frameData
+
+    samples = numpy.frombuffer(frameData, dtype={1: numpy.int8, 4: numpy.int32}[sampleWidth]).astype(numpy.int32)
+    return (samples * 256 if sampleWidth == 1 else samples >> 16).astype(numpy.int16).tobytes()
+
+
+class FileSource(AudioSource):
+    live = False
+
+    def __init__(self, path: str, speed: float = 1, loop: bool = False, chunk: int = 1024):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+        self.audioFile = None
+        self.next = None
+        self.ended = False
+        self.SAMPLE_RATE = None
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+
+        self.stream = self
+
+    def __enter__(self):
+        self.audioFile = AudioFile(self.path).__enter__()
+        self.SAMPLE_RATE = self.audioFile.SAMPLE_RATE
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.audioFile is None:
+            self.audioFile.__exit__(None, None, None)
+            self.audioFile = None
+
+    def pace(self, frames: int):
+        if self.speed <= 0:
+            return None
+
+        now = perf_counter()
+        self.next = now if self.next is None or self.next < now - 1 else self.next
+        self.next += frames / self.SAMPLE_RATE / self.speed
+
+        if self.next > now:
+            sleep(self.next - now)
+
+    def read(self, size: int):
+        frameData = self.audioFile.stream.read(size)
+
+        if len(frameData) == 0 and self.loop:
+            self.audioFile.__exit__(None, None, None)
+            self.audioFile = AudioFile(self.path).__enter__()
+            frameData = self.audioFile.stream.read(size)
+
+        if len(frameData) == 0 and not self.ended:
+            self.ended = True
+            return bytes(self.SAMPLE_RATE * 2)
+
+        if len(frameData) == 0:
+            raise EOFError(f"End of audio file {self.path}")
+
+        self.pace(len(frameData) // self.audioFile.SAMPLE_WIDTH)
+        return toInt16(frameData, self.audioFile.SAMPLE_WIDTH)
+
+
+class PipeSource(AudioSource):
+    live = False
+
+    def __init__(self, pipe: object = None, sampleRate: int = 16000, chunk: int = 1024):
+        self.pipe = sys.stdin.buffer if pipe is None else pipe
+
+        self.SAMPLE_RATE = sampleRate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def read(self, size: int):
+        frameData = self.pipe.read(size * 2)
+        if len(frameData) == 0:
+            raise EOFError("End of audio pipe")
+
+        return frameData[: len(frameData) // 2 * 2]
+
+
+class SocketSource(AudioSource):
+    live = False
+
+    def __init__(self, path: str, sampleRate: int = 16000, chunk: int = 1024, timeout: float = 0.5):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("UNIX sockets are not supported on this platform!")
+
+        self.path = path
+        self.timeout = timeout
+
+        self.SAMPLE_RATE = sampleRate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+
+        self.server = None
+        self.client = None
+        self.pending = b""
+
+        self.stream = self
+
+    def __enter__(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen(1)
+        self.server.settimeout(self.timeout)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for sock in (self.client, self.server):
+            if not sock is None:
+                sock.close()
+
+        self.client, self.server = None, None
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def read(self, size: int):
+        try:
+            if self.client is None:
+                self.client, _ = self.server.accept()
+                self.client.settimeout(self.timeout)
+
+            frameData = self.client.recv(size * 2 - len(self.pending))
+        except socket.timeout:
+            return bytes(int(self.timeout * self.SAMPLE_RATE) * 2)
+
+        if frameData == b"":
+            self.client.close()
+            self.client, self.pending = None, b""
+            return bytes(size * 2)
+
+        frameData, self.pending = self.pending + frameData, b""
+        if len(frameData) % 2 == 1:
+            frameData, self.pending = frameData[:-1], frameData[-1:]
+
+        return frameData
+
+
+def createSource(config: dict, deviceIndex: int = None):
+    source = config["Audio source"]
+
+    if source == "microphone":
+        return Microphone(deviceIndex)
+
+    if source == "file":
+        return FileSource(config["Audio file"], config["Audio speed"], config["Audio loop"])
+
+    if source == "stdin":
+        return PipeSource(sampleRate=config["Audio rate"])
+
+    if source == "socket":
+        return SocketSource(config["Audio socket"], config["Audio rate"])
+
+    raise ValueError(f"Audio source {source} not in {allSources}!")
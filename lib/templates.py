@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QComboBox, QFrame, QLabel, QPushButton, QSizePolicy, QSpinBox, QTextBrowser, QTextEdit
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtWidgets import QAbstractItemView, QCheckBox, QComboBox, QFrame, QLabel, QListView, QPushButton, QSizePolicy, QSpinBox
 
 
 def getLabel(text: str, sizePolicy: (QSizePolicy.Policy, QSizePolicy.Policy) = (QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)):
@@ -31,25 +32,38 @@ def getComboBox(items: list | tuple, current: str = "", connect: object = lambda
     return combo
 
 
-def getTextBrowser(text, sizePolicy: (QSizePolicy.Policy, QSizePolicy.Policy) = (QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)):
-    textbrowser = QTextBrowser()
-    textbrowser.setSizePolicy(*sizePolicy)
-    textbrowser.setLineWrapMode(QTextEdit.NoWrap)
-    textbrowser.insertHtml(text)
+def getListView(model: object, iconSize: int = 10, sizePolicy: (QSizePolicy.Policy, QSizePolicy.Policy) = (QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)):
+    listview = QListView()
+    listview.setSizePolicy(*sizePolicy)
+    listview.setModel(model)
+    listview.setUniformItemSizes(True)
+    listview.setIconSize(QSize(iconSize, iconSize))
+    listview.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    listview.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+    listview.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
-    return textbrowser
+    return listview
 
 
 def getSpinBox(value: int, range: tuple, connect: object = lambda: None, sizePolicy: (QSizePolicy.Policy, QSizePolicy.Policy) = (QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)):
     spinbox = QSpinBox()
-    spinbox.setValue(value)
     spinbox.setRange(*range)
+    spinbox.setValue(value)
     spinbox.setSizePolicy(*sizePolicy)
     spinbox.textChanged.connect(connect)
 
     return spinbox
 
 
+def getCheckBox(text: str, checked: bool = False, connect: object = lambda: None, sizePolicy: (QSizePolicy.Policy, QSizePolicy.Policy) = (QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)):
+    checkbox = QCheckBox(text)
+    checkbox.setSizePolicy(*sizePolicy)
+    checkbox.setChecked(checked)
+    checkbox.stateChanged.connect(connect)
+
+    return checkbox
+
+
 def getSpacer(shape: QFrame.Shape = QFrame.Shape.VLine):
     splitter = QFrame()
     splitter.setMinimumWidth(10)
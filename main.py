@@ -1,187 +1,173 @@
 import os
 import sys
-from string import printable
-from time import sleep
-from traceback import format_exc
-
-from lib import Config, Profile, Worker, allRecognizers, ignoreStderr, tpl
-from pynput.keyboard import Controller, Key
-from PySide6.QtCore import QThreadPool, QTimer
-from PySide6.QtGui import QTextCursor
-from PySide6.QtWidgets import QApplication, QFrame, QHBoxLayout, QLineEdit, QMainWindow, QPushButton, QSizePolicy, QSpinBox, QStatusBar, QVBoxLayout, QWidget
-from speech_recognition import Microphone, Recognizer, WaitTimeoutError
-
-
-class VCEngine:
+from math import log10
+from collections import deque
+from json import dump, load
+
+from lib import Config, LogBuffer, MacroExecutor, Profile, StageQueue, VCEngine, Worker, allRecognizers, ignoreStderr, startup
+from lib import templates as tpl
+from PySide6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, QRegularExpression, QSortFilterProxyModel, Qt, QThreadPool, QTimer
+from PySide6.QtGui import QIcon, QRegularExpressionValidator
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QFileDialog,
+    QFrame,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QMainWindow,
+    QMessageBox,
+    QSizePolicy,
+    QSpinBox,
+    QStatusBar,
+    QStyledItemDelegate,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+from speech_recognition import Microphone
+
+
+class VCApplication:
     def __init__(self):
-        self.stop = False
-
-        self.currentConfig = {}
-        self.currentProfile = {}
-
-        self.updateRecognizer = False
-        self.updateMicrophone = False
-        self.currentRecognizer = None
-        self.currentMicrophone = None
-
-        self.signals = None
-
-        self.listner = Recognizer()
-        self.keyboard = Controller()
+        self.engine = VCEngine(Config, Profile)
 
         self.app = QApplication(sys.argv)
-        self.window = VCMainWindow(self.app, self)
+        self.window = VCMainWindow(self.app, self.engine)
+        startup.mark("window")
         self.threadpool = QThreadPool()
 
         self.app.aboutToQuit.connect(self.quit)
 
         self.threadAudioListner = None
-        self.threadConfigListner = None
 
     def startAudioListner(self):
         def handleError(err):
             self.window.passLog(err, "Red")
             self.startAudioListner()
 
-        self.threadAudioListner = Worker(self.audioListner, acceptsSignals=True)
+        self.threadAudioListner = Worker(self.engine.run, acceptsSignals=True)
         self.threadAudioListner.signals.log.connect(self.window.passLog)
         self.threadAudioListner.signals.result.connect(self.window.passLog)
         self.threadAudioListner.signals.error.connect(handleError)
 
         self.threadpool.start(self.threadAudioListner)
 
-    def audioListner(self, signals):
-        self.signals = signals
+    def quit(self):
+        self.engine.quit()
+        self.window.logBuffer.close()
 
-        self.updateConfig()
-        self.updateProfile()
-        self.doUpdateRecognizer()
-        self.doUpdateMicrophone()
+    def main(self):
+        self.startAudioListner()
 
-        while not self.stop:
-            while self.currentRecognizer is None or self.currentMicrophone is None or self.currentConfig == {}:
-                sleep(0.1)
+        sys.exit(self.app.exec())
 
-            if self.updateRecognizer:
-                self.updateRecognizer = False
-                self.doUpdateRecognizer()
 
-            if self.updateMicrophone:
-                self.updateMicrophone = False
-                self.doUpdateMicrophone()
+class VCMainWindow(QMainWindow):
+    def __init__(self, app, engine):
+        super().__init__()
+        self.app = app
+        self.engine = engine
 
-            try:
-                with ignoreStderr():
-                    with self.currentMicrophone as source:
-                        audio = self.listner.listen(source, timeout=1, phrase_time_limit=self.currentConfig["Phrase time"])
-            except (WaitTimeoutError, AssertionError):
-                sleep(0.1)
-                continue
-            except AttributeError:
-                print(format_exc())
-                self.updateMicrophone = True
-                continue
+        self.workFolder = os.path.split(__file__)[0].replace("\\", "/")
 
-            command = self.currentRecognizer.run(audio)
-            if not command is None and command != "":
-                self.parseCommand(command)
+        self.logBuffer = LogBuffer(Config.get()["Log lines"], f"{self.workFolder}/logs/voicecommander.log" if Config.get()["Log file"] else None)
+        self.logModel = VCLogModel(self.logBuffer, self.workFolder)
+        self.logBuffer.append("Starting Voice Commander", "Yellow")
 
-    def updateConfig(self):
-        self.currentConfig = Config.get()
-        self.signals.log.emit(f"Loaded config", "Green")
+        self.logTimer = QTimer(self)
+        self.logTimer.timeout.connect(self.logModel.flush)
+        self.logTimer.start(100)
+        self.logModel.rowsInserted.connect(self.followLog)
 
-    def updateProfile(self):
-        self.currentProfile = Profile.get()
-        self.signals.log.emit(f"Loaded profile: {self.currentConfig['Profile']}", "Green")
+        self.setWindowTitle("Voice Commander")
+        self.resize(750, 200)
 
-    def doUpdateRecognizer(self):
-        self.currentRecognizer = allRecognizers[self.currentConfig["Speach Recognizer"]]["recognizer"](signals=self.signals, config=Config.get(), profile=Profile.get())
-        self.signals.log.emit(f"Loaded recognizer: {self.currentConfig['Speach Recognizer']}", "Green")
+        self.setCentralWidget(VCHomeWidget(self))
+        self.setStatusBar(QStatusBar(self))
+        self.label_devices = QLabel(self)
+        self.statusBar().addPermanentWidget(self.label_devices)
 
-    def doUpdateMicrophone(self):
-        with ignoreStderr():
-            newMicrophone = tuple(Microphone(i) for i, mic in enumerate(Microphone.list_microphone_names()) if mic == self.currentConfig["Microphone"])[0]
+        self.statusTimer = QTimer(self)
+        self.statusTimer.timeout.connect(self.updateStatus)
+        self.statusTimer.start(1000)
 
-        try:
-            with ignoreStderr():
-                with newMicrophone as source:
-                    self.listner.adjust_for_ambient_noise(source, 3)
-        except AttributeError:
-            with ignoreStderr():
-                spoofedMicrophone = tuple(mic for mic in Microphone.list_microphone_names() if "default" in mic)[0]
-            Config.set("Microphone", spoofedMicrophone)
-            self.signals.log.emit(f"Failed to select microphone: {spoofedMicrophone}", "Red")
-
-            self.updateConfig()
-            self.updateMicrophone = True
+        self.show()
 
+    def passLog(self, msg, color: str = "White"):
+        self.logBuffer.append(msg, color)
+
+    def updateStatus(self):
+        self.statusBar().showMessage(self.engine.metrics.statusText())
+
+        devices = [f"{device['name'][:16]} {20 * log10(max(device['level'], 0.00001)):.0f} dB" + (f", {device['dropped']} dropped" if device["dropped"] > 0 else "") + ("" if device["alive"] else ", stopped") for device in self.engine.deviceStats()]
+        if not self.engine.pipeline is None:
+            stats = self.engine.pipeline.stats()
+            devices.append(f"{stats['phrases']['dropped']} dropped, {stats['duplicates']} duplicates")
+        if hasattr(self.engine.currentRecognizer, "statusText"):
+            devices.append(self.engine.currentRecognizer.statusText())
+        self.label_devices.setText(" | ".join(devices))
+
+    def followLog(self):
+        listview = getattr(self.centralWidget(), "listview_log", None)
+        if listview is None:
             return None
 
-        self.currentMicrophone = newMicrophone
-        self.signals.log.emit(f"Listening to microphone: {self.currentConfig['Microphone']}", "Green")
+        scrollBar = listview.verticalScrollBar()
+        if scrollBar.value() >= scrollBar.maximum() - 1:
+            QTimer.singleShot(0, listview.scrollToBottom)
 
-    def parseCommand(self, command: str):
-        selectedIndex = None
+    def updateLog(self):
+        self.logBuffer.configure(Config.get()["Log lines"], f"{self.workFolder}/logs/voicecommander.log" if Config.get()["Log file"] else None)
 
-        for index, com, sensitivity in tuple((i, record["command"], record["sensitivity"]) for i, record in enumerate(self.currentProfile["voiceCommands"])):
-            if command == com:
-                self.exec(self.currentProfile["voiceCommands"][index]["macro"].split(";"))
-                return None
 
-            if not selectedIndex is None or sensitivity < 1:
-                continue
+class VCLogModel(QAbstractListModel):
+    def __init__(self, buffer: LogBuffer, workFolder: str):
+        super().__init__()
+        self.buffer = buffer
+        self.workFolder = workFolder
 
-            for subCom in command.split(" "):
-                if subCom == com:
-                    selectedIndex = index
-                    break
-
-        if not selectedIndex is None:
-            self.exec(self.currentProfile["voiceCommands"][selectedIndex[0]]["macro"].split(";"))
-
-    def exec(self, commands):
-        for sequence in commands:
-            if hasattr(Key, sequence):
-                key = getattr(Key, sequence)
-                if not callable(key):
-                    self.keyboard.press(key)
-                    self.keyboard.release(key)
-                    sleep(0.1)
-                    continue
-
-            for key in tuple(sequence):
-                if key in printable:
-                    self.keyboard.press(key)
-                    self.keyboard.release(key)
-                    sleep(0.1)
+        self.lines = deque()
+        self.icons = {}
 
-    def quit(self):
-        self.stop = True
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
 
-    def main(self):
-        self.startAudioListner()
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
 
-        sys.exit(self.app.exec())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.lines[index.row()][0]
 
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icon(self.lines[index.row()][1])
 
-class VCMainWindow(QMainWindow):
-    def __init__(self, app, engine):
-        super().__init__()
-        self.app = app
-        self.engine = engine
+        return None
 
-        self.setWindowTitle("Voice Commander")
-        self.resize(750, 200)
+    def icon(self, color: str):
+        if not color in self.icons:
+            self.icons[color] = QIcon(f"{self.workFolder}/images/{color}.svg")
 
-        self.setCentralWidget(VCHomeWidget(self))
-        self.setStatusBar(QStatusBar(self))
+        return self.icons[color]
 
-        self.show()
+    def flush(self):
+        entries = self.buffer.take()[-self.buffer.maxLines :]
+        if len(entries) == 0:
+            return None
 
-    def passLog(self, msg, color: str = "White"):
-        centralWidget = self.centralWidget()
-        if hasattr(centralWidget, "log"):
-            centralWidget.log(msg, color)
+        excess = max(0, len(self.lines) + len(entries) - self.buffer.maxLines)
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            for _ in range(excess):
+                self.lines.popleft()
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), len(self.lines), len(self.lines) + len(entries) - 1)
+        self.lines.extend(entries)
+        self.endInsertRows()
 
 
 class VCHomeWidget(QWidget):
@@ -196,8 +182,15 @@ class VCHomeWidget(QWidget):
         self.combo_profile = None
         self.combo_microphone = None
         self.combo_recognizer = None
-        self.textbrowser_text = None
+        self.listview_log = None
         self.spinBox_phraseTime = None
+        self.spinBox_vadThreshold = None
+        self.spinBox_vadHangover = None
+        self.spinBox_vadMinSpeech = None
+        self.combo_backpressure = None
+        self.checkBox_fuzzy = None
+        self.checkBox_logFile = None
+        self.combo_macroPolicy = None
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -213,9 +206,10 @@ class VCHomeWidget(QWidget):
         layout_middle.addLayout(self.layout_right)
         layout.addLayout(layout_middle)
 
-        self.leftLayout()
-        self.topLayout()
-        self.rightLayout()
+        with Config.batch():
+            self.leftLayout()
+            self.topLayout()
+            self.rightLayout()
 
     def topLayout(self):
         self.layout_top.addWidget(tpl.getLabel("Profile"))
@@ -240,8 +234,9 @@ class VCHomeWidget(QWidget):
         self.layout_top.addWidget(self.combo_microphone)
 
     def leftLayout(self):
-        self.textbrowser_text = tpl.getTextBrowser(f'<img src="{self.workFolder}/images/Yellow.svg" height="10"/> Starting Voice Commander')
-        self.layout_left.addWidget(self.textbrowser_text)
+        self.listview_log = tpl.getListView(self.win.logModel)
+        self.listview_log.scrollToBottom()
+        self.layout_left.addWidget(self.listview_log)
 
     def rightLayout(self):
         self.layout_right.addWidget(tpl.getSpacer(QFrame.Shape.HLine))
@@ -255,6 +250,37 @@ class VCHomeWidget(QWidget):
         self.spinBox_phraseTime = tpl.getSpinBox(Config.get()["Phrase time"], (0, 5), connect=self.setPhraseTime, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
         self.layout_right.addWidget(self.spinBox_phraseTime)
 
+        self.layout_right.addWidget(tpl.getLabel("Vad threshold"))
+
+        self.spinBox_vadThreshold = tpl.getSpinBox(Config.get()["Vad threshold"], (1, 20), connect=self.setVadThreshold, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        self.layout_right.addWidget(self.spinBox_vadThreshold)
+
+        self.layout_right.addWidget(tpl.getLabel("Vad hangover (ms)"))
+
+        self.spinBox_vadHangover = tpl.getSpinBox(Config.get()["Vad hangover"], (50, 3000), connect=self.setVadHangover, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        self.layout_right.addWidget(self.spinBox_vadHangover)
+
+        self.layout_right.addWidget(tpl.getLabel("Vad min speech (ms)"))
+
+        self.spinBox_vadMinSpeech = tpl.getSpinBox(Config.get()["Vad min speech"], (10, 3000), connect=self.setVadMinSpeech, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        self.layout_right.addWidget(self.spinBox_vadMinSpeech)
+
+        self.layout_right.addWidget(tpl.getLabel("Backpressure"))
+
+        self.combo_backpressure = tpl.getComboBox(StageQueue.allPolicies, Config.get()["Backpressure"], connect=self.setBackpressure, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        self.layout_right.addWidget(self.combo_backpressure)
+
+        self.checkBox_fuzzy = tpl.getCheckBox("Fuzzy matching", Config.get()["Fuzzy matching"], connect=self.setFuzzyMatching)
+        self.layout_right.addWidget(self.checkBox_fuzzy)
+
+        self.checkBox_logFile = tpl.getCheckBox("Log to file", Config.get()["Log file"], connect=self.setLogFile)
+        self.layout_right.addWidget(self.checkBox_logFile)
+
+        self.layout_right.addWidget(tpl.getLabel("Macro policy"))
+
+        self.combo_macroPolicy = tpl.getComboBox(MacroExecutor.allPolicies, Config.get()["Macro policy"], connect=self.setMacroPolicy, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        self.layout_right.addWidget(self.combo_macroPolicy)
+
         self.layout_right.addWidget(tpl.getSpacer(QFrame.Shape.HLine))
 
         self.layout_right.addWidget(tpl.getLabel("Recognizer"))
@@ -272,26 +298,21 @@ class VCHomeWidget(QWidget):
         if "Language" in recognizer["options"]:
             self.layout_right.addWidget(tpl.getLabel("Language"))
 
-            self.combo_language = tpl.getComboBox(
-                recognizer["recognizer"].allLanguages if hasattr(recognizer["recognizer"], "allLanguages") else (), Config.get()[f"{recognizerName}:Language"], connect=self.setLanguage, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-            )
+            self.combo_language = tpl.getComboBox(recognizer.get("languages", ()), Config.get()[f"{recognizerName}:Language"], connect=self.setLanguage, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
             Config.set(f"{recognizerName}:Language", self.combo_language.currentText())
             self.layout_right.addWidget(self.combo_language)
 
         if "Model" in recognizer["options"]:
             self.layout_right.addWidget(tpl.getLabel("Model"))
 
-            self.combo_model = tpl.getComboBox(
-                tuple(recognizer["recognizer"].allModels) if hasattr(recognizer["recognizer"], "allModels") else (), Config.get()[f"{recognizerName}:Model"], connect=self.setModel, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-            )
+            self.combo_model = tpl.getComboBox(recognizer.get("models", ()), Config.get()[f"{recognizerName}:Model"], connect=self.setModel, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
             Config.set(f"{recognizerName}:Model", self.combo_model.currentText())
             self.layout_right.addWidget(self.combo_model)
 
         self.layout_right.addStretch()
 
     def log(self, msg, color: str = "White"):
-        self.textbrowser_text.insertHtml(f'<br><img src="{self.workFolder}/images/{color}.svg" height="10"/> {msg}')
-        self.textbrowser_text.moveCursor(QTextCursor.MoveOperation(11), QTextCursor.MoveMode(0))
+        self.win.passLog(msg, color)
 
     def selectProfile(self):
         pf = self.combo_profile.currentText()
@@ -346,6 +367,36 @@ class VCHomeWidget(QWidget):
         Config.set("Phrase time", int(self.spinBox_phraseTime.text()))
         self.engine.updateConfig()
 
+    def setVadThreshold(self):
+        Config.set("Vad threshold", int(self.spinBox_vadThreshold.text()))
+        self.engine.updateConfig()
+
+    def setVadHangover(self):
+        Config.set("Vad hangover", int(self.spinBox_vadHangover.text()))
+        self.engine.updateConfig()
+
+    def setVadMinSpeech(self):
+        Config.set("Vad min speech", int(self.spinBox_vadMinSpeech.text()))
+        self.engine.updateConfig()
+
+    def setBackpressure(self):
+        Config.set("Backpressure", self.combo_backpressure.currentText())
+        self.engine.updateConfig()
+
+    def setMacroPolicy(self):
+        Config.set("Macro policy", self.combo_macroPolicy.currentText())
+        self.engine.updateConfig()
+
+    def setFuzzyMatching(self):
+        Config.set("Fuzzy matching", self.checkBox_fuzzy.isChecked())
+        self.engine.updateConfig()
+        self.engine.updateProfile()
+
+    def setLogFile(self):
+        Config.set("Log file", self.checkBox_logFile.isChecked())
+        self.win.updateLog()
+        self.log(f"Logging to file: {self.workFolder}/logs/voicecommander.log", "Yellow") if self.checkBox_logFile.isChecked() else self.log("Stopped logging to file.", "Yellow")
+
     def setSpeachRecognizer(self):
         Config.set("Speach Recognizer", self.combo_recognizer.currentText())
         self.win.setCentralWidget(VCHomeWidget(self.win))
@@ -363,15 +414,111 @@ class VCHomeWidget(QWidget):
         self.engine.updateRecognizer = True
 
 
+class VCProfileModel(QAbstractTableModel):
+    def __init__(self):
+        super().__init__()
+        self.keys = tuple(Profile.voiceCommandsTemplate)
+        self.records = Profile.get()["voiceCommands"]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.keys)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.keys[section]
+
+        return None
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+
+        return self.records[index.row()][self.keys[index.column()]]
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+
+        key = self.keys[index.column()]
+        value = Profile.voiceCommandsTemplate[key](value)
+        if key == "command":
+            value = "".join(char for char in tuple(value.lower()) if char.isalnum() or char.isspace())
+
+        record = {**self.records[index.row()], key: value}
+        Profile.setCommand(index.row(), record)
+        self.records[index.row()] = record
+
+        self.dataChanged.emit(index, index)
+        return True
+
+    def addCommands(self, records: list | tuple):
+        if len(records) == 0:
+            return None
+
+        Profile.addCommands(records)
+
+        self.beginInsertRows(QModelIndex(), len(self.records), len(self.records) + len(records) - 1)
+        self.records.extend(dict(record) for record in records)
+        self.endInsertRows()
+
+    def delCommands(self, rows: list | tuple):
+        rows = sorted(set(rows), reverse=True)
+        Profile.delCommands(rows)
+
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.records.pop(row)
+            self.endRemoveRows()
+
+
+class VCProfileDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        key = index.model().headerData(index.column(), Qt.Orientation.Horizontal)
+
+        if Profile.voiceCommandsTemplate[key] is int:
+            editor = QSpinBox(parent)
+            editor.setRange(0, 10)
+            return editor
+
+        editor = QLineEdit(parent)
+        if key == "command":
+            editor.setValidator(QRegularExpressionValidator(QRegularExpression(r"[\w\s]*"), editor))
+
+        return editor
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QSpinBox):
+            editor.setValue(index.data(Qt.ItemDataRole.EditRole))
+        else:
+            editor.setText(index.data(Qt.ItemDataRole.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.value() if isinstance(editor, QSpinBox) else editor.text(), Qt.ItemDataRole.EditRole)
+
+
 class VCProfileWidget(QWidget):
-    def __init__(self, window, autoFocus: int = 0):
+    def __init__(self, window):
         super().__init__()
         self.win = window
         self.app = window.app
         self.engine = window.engine
 
-        self.inp_newInput = {}
-        self.inp_recordInputs = []
+        self.workFolder = os.path.split(__file__)[0].replace("\\", "/")
+
+        self.model = VCProfileModel()
+        self.proxy = QSortFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(-1)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        self.inp_search = None
+        self.table_commands = None
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -384,108 +531,88 @@ class VCProfileWidget(QWidget):
         layout.addLayout(self.layout_bottom)
         self.bottomLayout()
 
-        layout.addStretch(0)
-
-        if len(self.inp_recordInputs) < 1:
-            return None
-
-        for key in self.inp_recordInputs[autoFocus]:
-            if not self.inp_recordInputs[autoFocus][key].text() in ("", "0"):
-                QTimer.singleShot(0, self.inp_recordInputs[autoFocus][key], self.inp_recordInputs[autoFocus][key].setFocus)
-                QTimer.singleShot(0, self.inp_recordInputs[autoFocus][key], self.inp_recordInputs[autoFocus][key].setCursorPosition(len(self.inp_recordInputs[autoFocus][key].text())))
-                break
-
     def topLayout(self):
         self.layout_top.addWidget(tpl.getLabel(f"Profile: {Profile.getShortProfile()}"))
 
-        button = QPushButton("Done")
-        button.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-        button.clicked.connect(self.done)
-        self.layout_top.addWidget(button)
-
-    def bottomLayout(self):
-        self.inp_newInput = {}
-
-        self.layout_bottom.addLayout(self._getHeader())
-
-        for layout in self._getRows():
-            self.layout_bottom.addLayout(layout)
+        self.layout_top.addWidget(tpl.getSpacer())
 
-        self.layout_bottom.addLayout(self._getInputRow())
+        self.layout_top.addWidget(tpl.getLabel("Key delay (ms)"))
+        self.layout_top.addWidget(tpl.getSpinBox(Profile.get().get("keyDelay", 100), (0, 1000), connect=self.setKeyDelay, sizePolicy=(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)))
 
-    def _getHeader(self):
-        row = QHBoxLayout()
-        for key in Profile.voiceCommandsTemplate:
-            label = tpl.getLabel(key, (QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed))
-            row.addWidget(label, {str: 4, int: 1}[Profile.voiceCommandsTemplate[key]])
+        self.layout_top.addWidget(tpl.getSpacer())
 
-        return row
+        self.inp_search = QLineEdit()
+        self.inp_search.setPlaceholderText("Search")
+        self.inp_search.textChanged.connect(self.proxy.setFilterFixedString)
+        self.layout_top.addWidget(self.inp_search)
 
-    def _getRows(self):
-        def lineEdited(element, key, index, value):
-            if key in "command":
-                element.setText("".join(char for char in tuple(value.lower()) if char.isalnum() or char.isspace()))
+        self.layout_top.addWidget(tpl.getButton("Add", connect=self.addCommand))
+        self.layout_top.addWidget(tpl.getButton("Delete", connect=self.delCommands))
+        self.layout_top.addWidget(tpl.getButton("Import", connect=self.importCommands))
+        self.layout_top.addWidget(tpl.getButton("Export", connect=self.exportCommands))
+        self.layout_top.addWidget(tpl.getButton("Done", connect=self.done))
 
-            record = {key: Profile.voiceCommandsTemplate[key](self.inp_recordInputs[index][key].text()) for key in Profile.voiceCommandsTemplate}
+    def bottomLayout(self):
+        self.table_commands = QTableView()
+        self.table_commands.setModel(self.proxy)
+        self.table_commands.setItemDelegate(VCProfileDelegate(self.table_commands))
+        self.table_commands.setSortingEnabled(False)
+        self.table_commands.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_commands.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.table_commands.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
-            if record == {key: Profile.voiceCommandsTemplate[key]() for key in Profile.voiceCommandsTemplate}:
-                Profile.delCommand(index)
-                self.win.setCentralWidget(VCProfileWidget(self.win))
-                return None
+        for column, key in enumerate(self.model.keys):
+            self.table_commands.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.Stretch if Profile.voiceCommandsTemplate[key] is str else QHeaderView.ResizeMode.ResizeToContents)
 
-            Profile.setCommand(index, record)
+        self.layout_bottom.addWidget(self.table_commands)
 
-        rows = []
-        for index, record in enumerate(Profile.get()["voiceCommands"]):
-            row = QHBoxLayout()
-            allLineEdits = {}
-            for key in Profile.voiceCommandsTemplate:
-                if Profile.voiceCommandsTemplate[key] is str:
-                    inp = QLineEdit(record[key])
-                    row.addWidget(inp, 4)
+    def setKeyDelay(self, value):
+        Profile.set("keyDelay", int(value))
 
-                elif Profile.voiceCommandsTemplate[key] is int:
-                    inp = QSpinBox()
-                    inp.setValue(record[key])
-                    inp.setRange(0, 10)
-                    row.addWidget(inp, 1)
+    def addCommand(self):
+        self.inp_search.clear()
+        self.model.addCommands(({key: Profile.voiceCommandsTemplate[key]() for key in Profile.voiceCommandsTemplate},))
 
-                inp.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-                inp.textChanged.connect(lambda value, element=inp, key=key, index=index: lineEdited(element, key, index, value))
-                allLineEdits[key] = inp
+        index = self.proxy.mapFromSource(self.model.index(self.model.rowCount() - 1, 0))
+        self.table_commands.scrollTo(index)
+        self.table_commands.setCurrentIndex(index)
+        self.table_commands.edit(index)
 
-            self.inp_recordInputs.append(allLineEdits)
-            rows.append(row)
+    def delCommands(self):
+        self.model.delCommands(tuple(self.proxy.mapToSource(index).row() for index in self.table_commands.selectionModel().selectedRows()))
 
-        return rows
+    def importCommands(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import commands", self.workFolder, "Profile (*.json)")
+        if path == "":
+            return None
 
-    def _getInputRow(self):
-        def lineEdited():
-            Profile.addCommand({key: Profile.voiceCommandsTemplate[key](self.inp_newInput[key].text()) for key in Profile.voiceCommandsTemplate})
-            self.win.setCentralWidget(VCProfileWidget(self.win, autoFocus=-1))
+        try:
+            with open(path, "r") as fileR:
+                records = load(fileR)
 
-        row = QHBoxLayout()
-        for key in Profile.voiceCommandsTemplate:
-            if Profile.voiceCommandsTemplate[key] is str:
-                inp = QLineEdit()
-                row.addWidget(inp, 4)
+            records = records["voiceCommands"] if type(records) is dict else records
+            for record in records:
+                Profile._voiceCommandsVerifyRecord(record)
 
-            elif Profile.voiceCommandsTemplate[key] is int:
-                inp = QSpinBox()
-                inp.setRange(0, 10)
-                row.addWidget(inp, 1)
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            QMessageBox.warning(self, "Import commands", f"Failed to import {path}!\n{err}")
+            return None
 
-            inp.textChanged.connect(lineEdited)
-            inp.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.model.addCommands(records)
 
-            self.inp_newInput[key] = inp
+    def exportCommands(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export commands", f"{self.workFolder}/{Profile.getShortProfile()}.json", "Profile (*.json)")
+        if path == "":
+            return None
 
-        return row
+        with open(path, "w") as fileW:
+            dump({**Profile.get(), "voiceCommands": self.model.records}, fileW, indent=4)
 
     def done(self):
+        Profile.flush()
         self.win.setCentralWidget(VCHomeWidget(self.win))
         self.engine.updateProfile()
 
 
 if __name__ == "__main__":
-    VCEngine().main()
+    VCApplication().main()